@@ -1,6 +1,11 @@
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
 import sys
+import threading
 from logging import handlers
 from pathlib import Path
 
@@ -9,7 +14,7 @@ import coloredlogs
 from config import config
 
 
-log_level = config["bot"]["log_level"]
+log_level = config.bot.log_level
 if not log_level:
     log_level = "NOTSET"
 
@@ -17,38 +22,128 @@ if not log_level:
 format_string = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
 log_format = logging.Formatter(format_string)
 
-# Make a Log directory and file
-log_file = Path("logs", "bot.log")
-log_file.parent.mkdir(exist_ok=True)
-file_handler = handlers.RotatingFileHandler(log_file, maxBytes=5242880, backupCount=7, encoding="utf8")
-file_handler.setFormatter(log_format)
-
-root_log = logging.getLogger()
-root_log.setLevel(log_level)
-root_log.addHandler(file_handler)
-
-# making logs colorful and easy to read
-if "COLOREDLOGS_LEVEL_STYLES" not in os.environ:
-    coloredlogs.DEFAULT_LEVEL_STYLES = {
-        **coloredlogs.DEFAULT_LEVEL_STYLES,
-        "trace": {"color": 246},
-        "critical": {"background": "red"},
-        "debug": coloredlogs.DEFAULT_LEVEL_STYLES["info"],
-    }
-
-coloredlogs.DEFAULT_LOG_FORMAT = format_string
-coloredlogs.DEFAULT_LOG_LEVEL = log_level
-coloredlogs.install(logger=root_log, stream=sys.stdout, isatty=True)
-
-# muffling "type" logs unless >= setLevel
-if root_log.level != 0:
-    if root_log.level < 20:
-        # Getting tired of the heartbeat blocked warning when debugging.
-        logging.getLogger("discord").setLevel(logging.ERROR)
-    else:
-        logging.getLogger("discord").setLevel(logging.WARNING)
-    logging.getLogger("websockets").setLevel(logging.WARNING)
-    logging.getLogger("chardet").setLevel(logging.WARNING)
-    logging.getLogger("asyncprawcore").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger(__name__)
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line for log ingestion.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(handlers.QueueHandler):
+    """
+    Puts records on a bounded queue without ever blocking the caller. When
+    the queue is full the record is dropped and counted, and the next record
+    that fits is preceded by a warning with the number dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The message is merged now, while its arguments still hold their current values, but the traceback is
+        # left for the listener thread to format.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with self._lock:
+            if self._pending:
+                notice = logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0, f"Dropped {self._pending} log records", None, None
+                )
+                try:
+                    self.queue.put_nowait(notice)
+                    self._pending = 0
+                except queue.Full:
+                    pass
+
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+                self._pending += 1
+
+
+class BoundedQueueListener(handlers.QueueListener):
+    """
+    Queue listener whose stop waits for room on a full queue, which the
+    listener thread is still draining, instead of raising.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def setup_logging() -> None:
+    """
+    Routes every log record through a bounded queue to a listener thread
+    that writes the log file and the console.
+    """
+    # Make a Log directory and file
+    log_file = Path("logs", "bot.log")
+    log_file.parent.mkdir(exist_ok=True)
+    file_handler = handlers.RotatingFileHandler(log_file, maxBytes=5242880, backupCount=7, encoding="utf8")
+    file_handler.setFormatter(JsonFormatter() if config.bot.log_format == "json" else log_format)
+
+    # making logs colorful and easy to read
+    if "COLOREDLOGS_LEVEL_STYLES" not in os.environ:
+        coloredlogs.DEFAULT_LEVEL_STYLES = {
+            **coloredlogs.DEFAULT_LEVEL_STYLES,
+            "trace": {"color": 246},
+            "critical": {"background": "red"},
+            "debug": coloredlogs.DEFAULT_LEVEL_STYLES["info"],
+        }
+
+    coloredlogs.DEFAULT_LOG_FORMAT = format_string
+    coloredlogs.DEFAULT_LOG_LEVEL = log_level
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(coloredlogs.ColoredFormatter(fmt=format_string))
+
+    # Formatting and writing happen on the listener thread, so logging from the event loop is only a queue put.
+    log_queue = queue.Queue(maxsize=config.bot.log_queue_size)
+    queue_handler = BoundedQueueHandler(log_queue)
+    log_listener = BoundedQueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    log_listener.start()
+    # Stopping the listener flushes whatever is still queued before the process exits.
+    atexit.register(log_listener.stop)
+
+    root_log = logging.getLogger()
+    root_log.setLevel(log_level)
+    root_log.addHandler(queue_handler)
+
+    # muffling "type" logs unless >= setLevel
+    if root_log.level != 0:
+        if root_log.level < 20:
+            # Getting tired of the heartbeat blocked warning when debugging.
+            logging.getLogger("discord").setLevel(logging.ERROR)
+        else:
+            logging.getLogger("discord").setLevel(logging.WARNING)
+        logging.getLogger("websockets").setLevel(logging.WARNING)
+        logging.getLogger("chardet").setLevel(logging.WARNING)
+        logging.getLogger("asyncprawcore").setLevel(logging.WARNING)
+        logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+
+# This module runs twice, as the top-level module imported by bot.py and as the chiya package, and each run defines its
+# own handler classes, so the check uses the stdlib base class. Setting up again would duplicate every record.
+if not any(isinstance(handler, handlers.QueueHandler) for handler in logging.getLogger().handlers):
+    setup_logging()
@@ -1,26 +1,49 @@
-import glob
+import asyncio
 import logging
-import os
 
 import discord
 from discord.ext import commands
 
 import __init__  # noqa
-import database
+from chiya import database
+from chiya.utils.http import sessions
+from chiya.utils.loader import discover_extensions, feature_name, load_extensions, required_config
 from config import config
 
 
-bot = commands.Bot(
-    command_prefix=config["bot"]["prefix"],
+class Chiya(commands.Bot):
+    async def start(self, *args, **kwargs) -> None:
+        """
+        Prepares the database alongside the gateway login rather than before it.
+        """
+        self.database_setup = asyncio.create_task(database.prepare())
+        self.database_setup.add_done_callback(self.on_database_setup)
+        await super().start(*args, **kwargs)
+
+    def on_database_setup(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            log.critical("Unable to set up the database, shutting down", exc_info=task.exception())
+            asyncio.create_task(self.close())
+
+    async def close(self) -> None:
+        """
+        Closes the shared HTTP session along with the bot's own connections.
+        """
+        await sessions.close()
+        await super().close()
+
+
+bot = Chiya(
+    command_prefix=config.bot.prefix,
     intents=discord.Intents(
-        messages=config["bot"]["intents"]["messages"],
-        message_content=config["bot"]["intents"]["message_content"],
-        guilds=config["bot"]["intents"]["guilds"],
-        members=config["bot"]["intents"]["members"],
-        bans=config["bot"]["intents"]["bans"],
-        reactions=config["bot"]["intents"]["reactions"],
+        messages=config.bot.intents.messages,
+        message_content=config.bot.intents.message_content,
+        guilds=config.bot.intents.guilds,
+        members=config.bot.intents.members,
+        bans=config.bot.intents.bans,
+        reactions=config.bot.intents.reactions,
     ),
-    case_insensitive=config["bot"]["case_insensitive"],
+    case_insensitive=config.bot.case_insensitive,
     help_command=None,
 )
 log = logging.getLogger(__name__)
@@ -35,7 +58,7 @@ async def on_ready() -> None:
 
     # TODO: Apparently changing presence in on_ready is bad practice and can result in connection interruption?
     await bot.change_presence(
-        activity=discord.Activity(type=discord.ActivityType.listening, name=config["bot"]["status"])
+        activity=discord.Activity(type=discord.ActivityType.listening, name=config.bot.status)
     )
 
     # TODO: Move this to an admin command rather than running every time the bot loads.
@@ -43,7 +66,15 @@ async def on_ready() -> None:
 
 
 if __name__ == "__main__":
-    for cog in glob.iglob(os.path.join("cogs", "**", "[!^_]*.py"), root_dir="chiya", recursive=True):
-        bot.load_extension(cog.replace("/", ".").replace("\\", ".").replace(".py", ""))
-    database.Database().setup()
-    bot.run(config["bot"]["token"])
+    # Only validates the connection settings, the schema checks run during login.
+    database.Database()
+
+    extensions = []
+    for extension in discover_extensions("chiya", config.cogs):
+        missing = config.require(feature_name(extension), required_config("chiya", extension))
+        if missing:
+            log.error(f"Not loading {extension}, config.yml is missing {', '.join(missing)}")
+        else:
+            extensions.append(extension)
+    load_extensions(bot, "chiya", extensions)
+    bot.run(config.bot.token)
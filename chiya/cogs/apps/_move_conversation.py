@@ -0,0 +1,162 @@
+import logging
+import re
+
+import discord
+from discord import message_command
+from discord.commands import context
+from discord.ext import commands
+from discord.ui import InputText, Modal
+
+from chiya import config
+from chiya.utils import embeds
+from chiya.utils.purge import BULK_DELETE_MAX_AGE
+from chiya.utils.webhooks import repost_many
+
+
+log = logging.getLogger(__name__)
+
+REQUIRED_CONFIG = ("roles", "categories", "channels.public")
+
+USER_ID_REGEX = re.compile(r"\d{15,20}")
+
+# Keeps the original message and its replies within a single bulk delete.
+MAX_REPLIES = 99
+SCAN_LIMIT = 300
+
+
+async def collect_conversation(message: discord.Message, replies: int, author_ids: set) -> list:
+    """
+    Returns the message followed by up to `replies` later messages in the
+    channel that were sent by one of the authors or reply to a message
+    already in the conversation, oldest first.
+    """
+    conversation = [message]
+    message_ids = {message.id}
+
+    async for reply in message.channel.history(after=message, limit=SCAN_LIMIT, oldest_first=True):
+        if len(conversation) > replies:
+            break
+        if reply.author.bot or reply.is_system():
+            continue
+
+        replying = reply.reference and reply.reference.message_id in message_ids
+        if reply.author.id in author_ids or replying:
+            conversation.append(reply)
+            message_ids.add(reply.id)
+
+    return conversation
+
+
+class MoveConversationModal(Modal):
+    def __init__(self, message: discord.Message, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.message = message
+        self.add_item(
+            InputText(
+                label="Replies:",
+                placeholder=f"How many following messages to move, up to {MAX_REPLIES}",
+                value="10",
+                required=True,
+                max_length=2,
+                style=discord.InputTextStyle.short,
+            )
+        )
+
+        self.add_item(
+            InputText(
+                label="Participants:",
+                placeholder="Other members taking part, as mentions or IDs",
+                required=False,
+                max_length=1024,
+                style=discord.InputTextStyle.long,
+            )
+        )
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        """
+        Move the conversation to #questions-and-help and remove the originals.
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        if not self.children[0].value.isdigit() or not 0 <= int(self.children[0].value) <= MAX_REPLIES:
+            embed = embeds.make_embed(
+                title="Error:",
+                description=f"The number of replies must be between 0 and {MAX_REPLIES}.",
+                color=discord.Color.red(),
+            )
+            return await interaction.followup.send(embed=embed, ephemeral=True)
+
+        author_ids = {self.message.author.id}
+        author_ids.update(int(user_id) for user_id in USER_ID_REGEX.findall(self.children[1].value or ""))
+        conversation = await collect_conversation(self.message, int(self.children[0].value), author_ids)
+
+        channel = interaction.guild.get_channel(config.channels.public.questions_and_help)
+        moved = await repost_many(channel, conversation, fallback_url=config.bot.webhook_url)
+        if not moved:
+            embed = embeds.make_embed(
+                title="Error:",
+                description=f"None of the messages could be moved to {channel.mention}, they were left in place.",
+                color=discord.Color.red(),
+            )
+            return await interaction.followup.send(embed=embed, ephemeral=True)
+
+        # Everything recent goes in one bulk delete, only messages past the bulk delete window are removed singly.
+        cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        recent = [message for message in moved if message.created_at > cutoff]
+        if recent:
+            await self.message.channel.delete_messages(recent)
+        for message in moved:
+            if message.created_at <= cutoff:
+                await message.delete()
+
+        noun = "message" if len(moved) == 1 else "messages"
+        description = f"Successfully moved {len(moved)} {noun} to: {channel.mention}"
+        if len(moved) < len(conversation):
+            description += f"\n{len(conversation) - len(moved)} could not be moved and were left in place."
+        success_embed = embeds.make_embed(description=description, color=discord.Color.green())
+        await interaction.followup.send(embed=success_embed, ephemeral=True)
+
+        mentions = " ".join(dict.fromkeys(message.author.mention for message in moved))
+        warning_embed = embeds.make_embed(
+            title="Warning: Your conversation was moved",
+            description=(
+                f"{mentions}, your conversation was moved to {channel.mention} "
+                "which is the more appropriate channel for help, questions, and support type "
+                "topics. Please continue your conversation in that channel."
+            ),
+            color=discord.Color.dark_gold(),
+        )
+        await self.message.channel.send(embed=warning_embed, delete_after=30)
+        await channel.send(mentions, delete_after=1)
+
+
+class MoveConversationApp(commands.Cog):
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+
+    @message_command(guild_ids=config.guild_ids, name="Move Conversation")
+    async def move_conversation(self, ctx: context.ApplicationContext, message: discord.Message) -> None:
+        """
+        Context menu command for moving a question and the replies that
+        follow it to #questions-and-help.
+
+        The replies are the following messages from the original author,
+        any listed participants, or replying to the conversation. They are
+        reposted in order and the originals are removed in a single bulk
+        delete.
+        """
+        staff = [x for x in ctx.author.roles if x.id in config.roles.staff_roles]
+        if not staff:
+            embed = embeds.error_embed(ctx, None, "You do not have permissions to use this command.")
+            return await ctx.respond(embed=embed, ephemeral=True)
+
+        if ctx.channel.category_id in config.categories.protected:
+            embed = embeds.error_embed(ctx, None, "You do not have permissions to use this command in this category.")
+            return await ctx.respond(embed=embed, ephemeral=True)
+
+        await ctx.send_modal(MoveConversationModal(message, title="Move Conversation"))
+
+
+def setup(bot: commands.Bot) -> None:
+    bot.add_cog(MoveConversationApp(bot))
+    log.info("App loaded: move_conversation")
@@ -1,62 +1,44 @@
 import logging
 
-import aiohttp
 import discord
-from discord import message_command, Webhook
+from discord import message_command
 from discord.commands import context
 from discord.ext import commands
 
 from chiya import config
 from chiya.utils import embeds
+from chiya.utils.webhooks import repost
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles", "categories", "channels.public")
+
 
 class MoveQuestionApp(commands.Cog):
     def __init__(self, bot) -> None:
         self.bot = bot
 
-    @message_command(guild_ids=config["guild_ids"], name="Move Question")
+    @message_command(guild_ids=config.guild_ids, name="Move Question")
     async def move_question(self, ctx: context.ApplicationContext, message: discord.Message) -> None:
         """
         Context menu command for moving questions (messages) to
-        #questions-and-help.
+        #questions-and-help, along with their attachments and embeds.
         """
         await ctx.defer(ephemeral=True)
 
-        staff = [x for x in ctx.author.roles if x.id == config["roles"]["staff"] or x.id == config["roles"]["trial"]]
+        staff = [x for x in ctx.author.roles if x.id in config.roles.staff_roles]
         if not staff:
             return await embeds.error_message(ctx=ctx, description="You do not have permissions to use this command.")
 
-        if ctx.channel.category_id in [
-            config["categories"]["moderation"],
-            config["categories"]["development"],
-            config["categories"]["logs"],
-            config["categories"]["tickets"],
-        ]:
+        if ctx.channel.category_id in config.categories.protected:
             return await embeds.error_message(
                 ctx=ctx,
                 description="You do not have permissions to use this command in this category.",
             )
 
-        channel = discord.utils.get(
-            ctx.guild.text_channels,
-            id=config["channels"]["public"]["questions_and_help"],
-        )
-
-        async with aiohttp.ClientSession() as session:
-            webhook = Webhook.from_url(
-                url=config["bot"]["webhook_url"],
-                session=session,
-            )
-
-            await webhook.send(
-                content=message.content,
-                username=message.author.name,
-                avatar_url=message.author.avatar,
-            )
-
+        channel = ctx.guild.get_channel(config.channels.public.questions_and_help)
+        await repost(channel, message, fallback_url=config.bot.webhook_url)
         await message.delete()
 
         success_embed = embeds.make_embed(
@@ -12,6 +12,8 @@ from chiya.utils import embeds
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles", "categories")
+
 
 @commands.Cog.listener()
 async def on_ready(self) -> None:
@@ -36,7 +38,7 @@ class ReportCloseButton(discord.ui.View):
         """
         The close button to close and archive an existing report.
         """
-        role_staff = discord.utils.get(interaction.guild.roles, id=config["roles"]["staff"])
+        role_staff = discord.utils.get(interaction.guild.roles, id=config.roles.staff)
         if role_staff not in interaction.user.roles:
             embed = embeds.make_embed(
                 title="Failed to close report",
@@ -91,19 +93,14 @@ class ReportMessageApp(commands.Cog):
     def __init__(self, bot) -> None:
         self.bot = bot
 
-    @message_command(guild_ids=config["guild_ids"], name="Report Message")
+    @message_command(guild_ids=config.guild_ids, name="Report Message")
     async def report_message(self, ctx: context.ApplicationContext, message: discord.Message) -> None:
         """
         Context menu command for reporting messages to staff.
         """
         await ctx.defer(ephemeral=True)
 
-        if ctx.channel.category_id in [
-            config["categories"]["moderation"],
-            config["categories"]["development"],
-            config["categories"]["logs"],
-            config["categories"]["tickets"],
-        ]:
+        if ctx.channel.category_id in config.categories.protected:
             return await embeds.error_message(
                 ctx=ctx,
                 description="You do not have permissions to use this command in this category.",
@@ -115,7 +112,7 @@ class ReportMessageApp(commands.Cog):
                 description="You do not have permissions to use this command on this user.",
             )
 
-        category = discord.utils.get(ctx.guild.categories, id=config["categories"]["tickets"])
+        category = discord.utils.get(ctx.guild.categories, id=config.categories.tickets)
         report = discord.utils.get(category.text_channels, name=f"report-{message.id + ctx.author.id}")
         if report:
             return await embeds.error_message(ctx, description=f"You already have a report open: {report.mention}")
@@ -154,7 +151,7 @@ class ReportMessageApp(commands.Cog):
                 name=f"report-{message.id + ctx.author.id}",
                 category=category,
                 overwrites={
-                    discord.utils.get(ctx.guild.roles, id=config["roles"]["staff"]): discord.PermissionOverwrite(
+                    discord.utils.get(ctx.guild.roles, id=config.roles.staff): discord.PermissionOverwrite(
                         read_messages=True
                     ),
                     ctx.guild.default_role: discord.PermissionOverwrite(read_messages=False),
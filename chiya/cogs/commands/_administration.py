@@ -14,6 +14,8 @@ from chiya.utils import embeds
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles", "emoji_guild_ids")
+
 
 class AdministrationCommands(Cog):
     """
@@ -164,7 +166,7 @@ class AdministrationCommands(Cog):
         embed = discord.Embed(
             description=(
                 "You can react to one of the squares below to be assigned a colored user role. "
-                f"If you are interested in a different color, you can become a <@&{config['roles']['nitro_booster']}> "
+                f"If you are interested in a different color, you can become a <@&{config.roles.nitro_booster}> "
                 "to receive a custom colored role."
             )
         )
@@ -172,7 +174,7 @@ class AdministrationCommands(Cog):
         msg = await ctx.send(embed=embed)
 
         # API call to fetch all the emojis to cache, so that they work in future calls
-        emotes_guild = await ctx.bot.fetch_guild(config["emoji_guild_ids"][0])
+        emotes_guild = await ctx.bot.fetch_guild(config.emoji_guild_ids[0])
         await emotes_guild.fetch_emojis()
 
         await msg.add_reaction(":redsquare:805032092907601952")
@@ -200,7 +202,7 @@ class AdministrationCommands(Cog):
         msg = await ctx.send(embed=embed)
 
         # API call to fetch all the emojis to cache, so that they work in future calls
-        emotes_guild = await ctx.bot.fetch_guild(config["emoji_guild_ids"][0])
+        emotes_guild = await ctx.bot.fetch_guild(config.emoji_guild_ids[0])
         await emotes_guild.fetch_emojis()
 
         await msg.add_reaction("🎁")
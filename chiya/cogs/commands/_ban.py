@@ -1,17 +1,23 @@
+import asyncio
 import logging
-import time
 
 import discord
 from discord.commands import Option, context, slash_command
 from discord.ext import commands
 
-from chiya import config, database
+from chiya import config
 from chiya.utils import embeds
 from chiya.utils.helpers import can_action_member
+from chiya.utils.modlogs import format_summary, log_mod_action, summaries
+from chiya.utils.notifications import notifications
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles",)
+
+BAN_DM_TIMEOUT = 5
+
 
 class BansCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
@@ -26,8 +32,8 @@ class BansCommands(commands.Cog):
         except discord.NotFound:
             return False
 
-    @slash_command(guild_ids=config["guild_ids"])
-    @commands.has_role(config["roles"]["staff"])
+    @slash_command(guild_ids=config.guild_ids)
+    @commands.has_role(config.roles.staff)
     async def ban(
         self,
         ctx: context.ApplicationContext,
@@ -74,52 +80,38 @@ class BansCommands(commands.Cog):
             color=discord.Color.red(),
         )
 
-        dm_embed = embeds.make_embed(
-            author=False,
+        dm_embed = await embeds.make_dm_embed(
+            guild=ctx.guild,
             title="Uh-oh, you've been banned!",
             description=(
                 "You can submit a ban appeal on our subreddit [here]"
                 "(https://www.reddit.com/message/compose/?to=/r/snackbox)."
             ),
             image_url="https://i.imgur.com/CglQwK5.gif",
-            color=discord.Color.blurple(),
             fields=[
-                {"name": "Server:", "value": f"[{ctx.guild.name}]({await ctx.guild.vanity_invite()})", "inline": True},
                 {"name": "Moderator:", "value": ctx.author.mention, "inline": True},
                 {"name": "Reason:", "value": reason, "inline": True},
             ],
         )
 
+        # The user can no longer be messaged once banned unless they share another server with the bot, so the DM
+        # skips the queue and the ban waits for it, but never longer than BAN_DM_TIMEOUT.
+        delivery = notifications.send(user, dm_embed, urgent=True)
+        embed.add_field(name="History:", value=format_summary(await summaries.get(user.id)), inline=False)
+        await asyncio.wait({delivery}, timeout=BAN_DM_TIMEOUT)
+
         try:
-            await user.send(embed=dm_embed)
-        except discord.Forbidden:
-            embed.add_field(
-                name="Notice:",
-                value=(
-                    f"Unable to message {user.mention} about this action. "
-                    "This can be caused by the user not being in the server, "
-                    "having DMs disabled, or having the bot blocked."
-                ),
-            )
-
-        db = database.Database().get()
-        db["mod_logs"].insert(
-            dict(
-                user_id=user.id,
-                mod_id=ctx.author.id,
-                timestamp=int(time.time()),
-                reason=reason,
-                type="ban",
-            )
-        )
-        db.commit()
-        db.close()
+            await ctx.guild.ban(user=user, reason=reason, delete_message_days=daystodelete or 0)
+        except discord.HTTPException as e:
+            log.warning(f"Unable to ban {user}: {e}")
+            return await embeds.error_message(ctx=ctx, description=f"Unable to ban {user.mention}: {e.text or e}")
 
-        await ctx.guild.ban(user=user, reason=reason, delete_message_days=daystodelete or 0)
-        await ctx.send_followup(embed=embed)
+        log_mod_action(user_id=user.id, mod_id=ctx.author.id, reason=reason, type="ban")
+        message = await ctx.send_followup(embed=embed)
+        notifications.report(delivery, message, embed, user)
 
-    @slash_command(guild_ids=config["guild_ids"])
-    @commands.has_role(config["roles"]["staff"])
+    @slash_command(guild_ids=config.guild_ids)
+    @commands.has_role(config.roles.staff)
     async def unban(
         self,
         ctx: context.ApplicationContext,
@@ -153,12 +145,7 @@ class BansCommands(commands.Cog):
             color=discord.Color.green(),
         )
 
-        db = database.Database().get()
-        db["mod_logs"].insert(
-            dict(user_id=user.id, mod_id=ctx.author.id, timestamp=int(time.time()), reason=reason, type="unban")
-        )
-        db.commit()
-        db.close()
+        log_mod_action(user_id=user.id, mod_id=ctx.author.id, reason=reason, type="unban")
 
         await ctx.guild.unban(user=user, reason=reason)
         await ctx.send_followup(embed=embed)
@@ -1,25 +1,29 @@
 import logging
-import time
 from datetime import datetime, timezone
 
 import discord
 from discord.commands import Option, context, slash_command
 from discord.ext import commands
 
-from chiya import config, database
+from chiya import config
 from chiya.utils import embeds
-from chiya.utils.helpers import can_action_member, get_duration
+from chiya.utils.helpers import can_action_member
+from chiya.utils.modlogs import format_summary, log_mod_action, summaries
+from chiya.utils.notifications import notifications
+from chiya.utils.timeparse import get_user_timezone, parse_time
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles",)
+
 
 class MuteCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
-    @slash_command(guild_ids=config["guild_ids"], description="Mutes a member in the server")
-    @commands.has_any_role(config["roles"]["staff"], config["roles"]["chat_mod"])
+    @slash_command(guild_ids=config.guild_ids, description="Mutes a member in the server")
+    @commands.has_any_role(config.roles.staff, config.roles.chat_mod)
     async def mute(
         self,
         ctx: context.ApplicationContext,
@@ -50,16 +54,19 @@ class MuteCommands(commands.Cog):
         if len(reason) > 1024:
             return await embeds.error_message(ctx=ctx, description="Reason must be less than 1024 characters.")
 
-        duration_string, mute_end_time = get_duration(duration=duration)
-        if not duration_string:
+        parsed = parse_time(duration, tz=await get_user_timezone(ctx.author.id))
+        if not parsed:
             return await embeds.error_message(
                 ctx=ctx,
                 description=(
                     "Duration syntax: `y#mo#w#d#h#m#s` (year, month, week, day, hour, min, sec)\n"
-                    "You can specify up to all seven but you only need one."
+                    "You can specify up to all seven but you only need one.\n"
+                    "Dates like `2026-12-01 18:00` or `tomorrow 9am` are also accepted, "
+                    "in the timezone set with `/reminder timezone`."
                 ),
             )
 
+        duration_string, mute_end_time = parsed.description, parsed.end_time
         time_delta = mute_end_time - datetime.now(tz=timezone.utc).timestamp()
 
         if time_delta >= 2419200:
@@ -74,50 +81,36 @@ class MuteCommands(commands.Cog):
             fields=[{"name": "Duration:", "value": duration_string, "inline": False}],
         )
 
-        dm_embed = embeds.make_embed(
+        dm_embed = await embeds.make_dm_embed(
+            guild=ctx.guild,
             title="Uh-oh, you've been muted!",
             description="If you believe this was a mistake, contact staff.",
             image_url="https://i.imgur.com/840Q48l.gif",
-            color=discord.Color.blurple(),
             fields=[
-                {"name": "Server:", "value": f"[{ctx.guild.name}]({await ctx.guild.vanity_invite()})", "inline": True},
                 {"name": "Moderator:", "value": ctx.author.mention, "inline": True},
                 {"name": "Duration:", "value": duration_string, "inline": True},
                 {"name": "Reason:", "value": reason, "inline": False},
             ],
         )
 
-        try:
-            await member.send(embed=dm_embed)
-        except discord.Forbidden:
-            mute_embed.add_field(
-                name="Notice:",
-                value=(
-                    f"Unable to message {member.mention} about this action. "
-                    "This can be caused by the user not being in the server, "
-                    "having DMs disabled, or having the bot blocked."
-                ),
-            )
+        delivery = notifications.send(member, dm_embed)
 
-        db = database.Database().get()
-        db["mod_logs"].insert(
-            dict(
-                user_id=member.id,
-                mod_id=ctx.author.id,
-                timestamp=int(time.time()),
-                reason=reason,
-                duration=duration_string,
-                type="mute",
-            )
+        mute_embed.add_field(name="History:", value=format_summary(await summaries.get(member.id)), inline=False)
+        log_mod_action(
+            mute_until=mute_end_time,
+            user_id=member.id,
+            mod_id=ctx.author.id,
+            reason=reason,
+            duration=duration_string,
+            type="mute",
         )
-        db.commit()
-        db.close()
 
         await member.timeout(until=datetime.utcfromtimestamp(mute_end_time), reason=reason)
-        await ctx.send_followup(embed=mute_embed)
+        message = await ctx.send_followup(embed=mute_embed)
+        notifications.report(delivery, message, mute_embed, member)
 
-    @slash_command(guild_ids=config["guild_ids"], description="Unmute a member in the server")
-    @commands.has_role(config["roles"]["staff"])
+    @slash_command(guild_ids=config.guild_ids, description="Unmute a member in the server")
+    @commands.has_role(config.roles.staff)
     async def unmute(
         self,
         ctx: context.ApplicationContext,
@@ -154,45 +147,23 @@ class MuteCommands(commands.Cog):
             thumbnail_url="https://i.imgur.com/W7DpUHC.png",
         )
 
-        dm_embed = embeds.make_embed(
-            author=False,
+        dm_embed = await embeds.make_dm_embed(
+            guild=ctx.guild,
             title="Yay, you've been unmuted!",
             description="Review our server rules to avoid being actioned again in the future.",
             image_url="https://i.imgur.com/U5Fvr2Y.gif",
-            color=discord.Color.blurple(),
             fields=[
-                {"name": "Server:", "value": f"[{ctx.guild.name}]({await ctx.guild.vanity_invite()})", "inline": True},
                 {"name": "Moderator:", "value": ctx.author.mention, "inline": True},
                 {"name": "Reason:", "value": reason, "inline": False},
             ],
         )
-        try:
-            await member.send(embed=dm_embed)
-        except discord.Forbidden:
-            unmute_embed.add_field(
-                name="Notice:",
-                value=(
-                    f"Unable to message {member.mention} about this action. "
-                    "This can be caused by the user not being in the server, "
-                    "having DMs disabled, or having the bot blocked."
-                ),
-            )
+        delivery = notifications.send(member, dm_embed)
 
-        db = database.Database().get()
-        db["mod_logs"].insert(
-            dict(
-                user_id=member.id,
-                mod_id=ctx.author.id,
-                timestamp=int(time.time()),
-                reason=reason,
-                type="unmute",
-            )
-        )
-        db.commit()
-        db.close()
+        log_mod_action(user_id=member.id, mod_id=ctx.author.id, reason=reason, type="unmute")
 
         await member.remove_timeout(reason=reason)
-        await ctx.send_followup(embed=unmute_embed)
+        message = await ctx.send_followup(embed=unmute_embed)
+        notifications.report(delivery, message, unmute_embed, member)
 
 
 def setup(bot: commands.Bot) -> None:
@@ -1,25 +1,118 @@
 import logging
 import time
 from datetime import datetime
+from functools import partial
 
 import discord
 from discord.commands import Option, context, slash_command
 from discord.ext import commands
+from sqlalchemy.exc import SQLAlchemyError
 
 from chiya import config, database
 from chiya.utils import embeds
-from chiya.utils.pagination import LinePaginator
+from chiya.utils.modlogs import format_summary, log_mod_action, summaries
+from chiya.utils.pagination import ButtonPaginator, KeysetPageSource, LinePaginator, QueryPageSource
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles",)
+
+ACTION_EMOJI = {
+    "mute": "🤐",
+    "unmute": "🗣",
+    "warn": "⚠",
+    "ban": "🔨",
+    "unban": "⚒",
+    "note": "🗒️",
+}
+
+
+def format_mod_action(action: dict, show_user: bool = False) -> str:
+    """
+    Formats a single mod_logs row for the /search and /searchlogs output.
+    """
+    action_type = f"{ACTION_EMOJI[action['type']]} {action['type'].capitalize()}"
+    action_string = f"**{action_type}**\n**ID:** {action['id']}\n"
+
+    if show_user:
+        action_string += f"**User:** <@!{action['user_id']}>\n"
+
+    action_string += (
+        f"**Timestamp:** {datetime.fromtimestamp(action['timestamp'])} UTC\n"
+        f"**Moderator:** <@!{action['mod_id']}>\n"
+        f"**Reason:** {action['reason']}"
+    )
+
+    if action["type"] == "mute":
+        action_string += f"\n**Duration:** {action['duration']}"
+
+    return action_string
+
+
+def build_fulltext_filter(query: str, filters: dict) -> tuple:
+    """
+    Builds the WHERE clause and bind parameters for a full-text search over
+    mod_logs.reason, combined with the optional equality and range filters.
+    """
+    clauses = ["MATCH(reason) AGAINST(:query IN BOOLEAN MODE)"]
+    params = dict(query=query)
+
+    for column in ("user_id", "mod_id", "type"):
+        if filters.get(column) is not None:
+            clauses.append(f"{column} = :{column}")
+            params[column] = filters[column]
+
+    if filters.get("after") is not None:
+        clauses.append("timestamp >= :after")
+        params["after"] = filters["after"]
+
+    if filters.get("before") is not None:
+        clauses.append("timestamp < :before")
+        params["before"] = filters["before"]
+
+    return " AND ".join(clauses), params
+
+
+class ModLogSearchSource(QueryPageSource):
+    """
+    Pages over full-text search results ranked by relevance.
+
+    Relevance ordering has no stable key to seek on, so pages are fetched
+    with LIMIT/OFFSET instead. The FULLTEXT index keeps each page cheap.
+    """
+
+    def __init__(self, query: str, filters: dict, **kwargs) -> None:
+        super().__init__("mod_logs", formatter=partial(format_mod_action, show_user=True), per_page=4, **kwargs)
+        self.where, self.params = build_fulltext_filter(query, filters)
+
+    def fetch_rows(self, index: int) -> list:
+        db = database.Database().get()
+        rows = list(
+            db.query(
+                f"SELECT *, MATCH(reason) AGAINST(:query IN BOOLEAN MODE) AS score FROM mod_logs WHERE {self.where} "
+                "ORDER BY score DESC, id DESC LIMIT :limit OFFSET :offset",
+                limit=self.per_page,
+                offset=index * self.per_page,
+                **self.params,
+            )
+        )
+        db.close()
+        return rows
+
+    def count_rows(self) -> int:
+        db = database.Database().get()
+        total = next(iter(db.query(f"SELECT COUNT(*) AS total FROM mod_logs WHERE {self.where}", **self.params)))
+        db.close()
+        return total["total"]
+
 
 class NoteCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
-    @slash_command(name="addnote", guild_ids=config["guild_ids"])
-    @commands.has_role(config["roles"]["staff"])
+    @slash_command(name="addnote", guild_ids=config.guild_ids)
+    @commands.has_role(config.roles.staff)
     async def add_note(
         self,
         ctx: context.ApplicationContext,
@@ -38,18 +131,7 @@ class NoteCommands(commands.Cog):
         if not isinstance(user, discord.Member):
             user = await self.bot.fetch_user(user)
 
-        db = database.Database().get()
-        note_id = db["mod_logs"].insert(
-            dict(
-                user_id=user.id,
-                mod_id=ctx.author.id,
-                timestamp=int(time.time()),
-                reason=note,
-                type="note",
-            )
-        )
-        db.commit()
-        db.close()
+        note_id = await log_mod_action(need_id=True, user_id=user.id, mod_id=ctx.author.id, reason=note, type="note")
 
         embed = embeds.make_embed(
             title=f"Noting user: {user.name}",
@@ -59,13 +141,14 @@ class NoteCommands(commands.Cog):
             fields=[
                 {"name": "ID:", "value": note_id, "inline": False},
                 {"name": "Note:", "value": note, "inline": False},
+                {"name": "History:", "value": format_summary(await summaries.get(user.id)), "inline": False},
             ],
         )
 
         await ctx.send_followup(embed=embed)
 
-    @slash_command(name="search", guild_ids=config["guild_ids"])
-    @commands.has_role(config["roles"]["staff"])
+    @slash_command(name="search", guild_ids=config.guild_ids)
+    @commands.has_role(config.roles.staff)
     async def search_mod_actions(
         self,
         ctx: context.ApplicationContext,
@@ -91,58 +174,90 @@ class NoteCommands(commands.Cog):
         if not isinstance(user, discord.Member):
             user = await self.bot.fetch_user(user.id)
 
-        db = database.Database().get()
-        # TODO: can't this be merged into one call because action will return None either way?
+        filters = dict(user_id=user.id)
         if action:
-            results = db["mod_logs"].find(user_id=user.id, type=action, order_by="-id")
-        else:
-            results = db["mod_logs"].find(user_id=user.id, order_by="-id")
-        db.close()
+            filters["type"] = action
 
-        actions = []
-        for action in results:
-            action_emoji = {
-                "mute": "🤐",
-                "unmute": "🗣",
-                "warn": "⚠",
-                "ban": "🔨",
-                "unban": "⚒",
-                "note": "🗒️",
-            }
-
-            action_type = action["type"]
-            action_type = action_type[0].upper() + action_type[1:]
-            action_type = f"{action_emoji[action['type']]} {action_type}"
-
-            action_string = f"""**{action_type}**
-                **ID:** {action["id"]}
-                **Timestamp:** {datetime.fromtimestamp(action["timestamp"])} UTC
-                **Moderator:** <@!{action["mod_id"]}>
-                **Reason:** {action["reason"]}"""
-
-            if action["type"] == "mute":
-                action_string += f"\n**Duration:** {action['duration']}"
-
-            actions.append(action_string)
-
-        if not actions:
+        # The page total is counted from mod_logs itself, the cached summary may lag behind queued writes.
+        source = KeysetPageSource("mod_logs", formatter=format_mod_action, per_page=4, **filters)
+        if not await source.get_page_count():
             return await embeds.error_message(ctx=ctx, description="No mod actions found for that user!")
 
-        embed = embeds.make_embed(title="Mod Actions")
+        summary = await summaries.get(user.id)
+
+        embed = embeds.make_embed(
+            title="Mod Actions",
+            fields=[{"name": "Summary:", "value": format_summary(summary), "inline": False}],
+        )
         embed.set_author(name=user, icon_url=user.display_avatar)
 
-        await LinePaginator.paginate(
-            lines=actions,
-            ctx=ctx,
-            embed=embed,
-            max_lines=4,
-            max_size=2000,
-            linesep="\n",
-            timeout=120,
+        await ButtonPaginator(source, embed=embed, restrict_to_user=ctx.author, timeout=120).start(ctx)
+
+    @slash_command(name="searchlogs", guild_ids=config.guild_ids)
+    @commands.has_role(config.roles.staff)
+    async def search_mod_logs(
+        self,
+        ctx: context.ApplicationContext,
+        query: Option(
+            str,
+            description='Words to search the reasons for, use "quotes" for phrases and +word to require a word',
+            required=True,
+        ),
+        action: Option(
+            str,
+            description="Filter specific actions",
+            choices=["ban", "unban", "mute", "unmute", "warn", "note"],
+            required=False,
+        ),
+        user: Option(discord.User, description="Only search the actions on this user", required=False),
+        moderator: Option(discord.User, description="Only search the actions by this moderator", required=False),
+        after: Option(str, description="Only search actions on or after this date (YYYY-MM-DD)", required=False),
+        before: Option(str, description="Only search actions before this date (YYYY-MM-DD)", required=False),
+    ) -> None:
+        """
+        Full-text search over the reasons of every mod action and note,
+        ranked by relevance.
+
+        Uses the FULLTEXT index on mod_logs.reason in boolean mode, so
+        phrases can be matched with double quotes and words can be required
+        or excluded with + and -. It is imperative that the command is not
+        ran in public channels because the output is not hidden.
+        """
+        await ctx.defer()
+
+        try:
+            after = int(datetime.strptime(after, "%Y-%m-%d").timestamp()) if after else None
+            before = int(datetime.strptime(before, "%Y-%m-%d").timestamp()) if before else None
+        except ValueError:
+            return await embeds.error_message(ctx=ctx, description="Dates must be in the YYYY-MM-DD format.")
+
+        filters = dict(
+            user_id=user.id if user else None,
+            mod_id=moderator.id if moderator else None,
+            type=action,
+            after=after,
+            before=before,
         )
+        source = ModLogSearchSource(query, filters)
+        try:
+            page_count = await source.get_page_count()
+        except SQLAlchemyError:
+            # MySQL rejects malformed boolean mode syntax, such as an unbalanced quote or a lone operator.
+            log.debug(f"Full-text search for {query!r} failed", exc_info=True)
+            return await embeds.error_message(
+                ctx=ctx,
+                description='That search could not be run, check for unbalanced "quotes" or lone +, - or @ operators.',
+            )
+
+        if not page_count:
+            return await embeds.error_message(ctx=ctx, description="No mod actions matched that search!")
 
-    @slash_command(name="editlog", guild_ids=config["guild_ids"])
-    @commands.has_role(config["roles"]["staff"])
+        embed = embeds.make_embed(title=f"Search results: {query}"[:256])
+
+        await ButtonPaginator(source, embed=embed, restrict_to_user=ctx.author, timeout=120).start(ctx)
+
+    @slash_command(name="editlog", guild_ids=config.guild_ids)
+    @commands.has_role(config.roles.staff)
     async def edit_log(
         self,
         ctx: context.ApplicationContext,
@@ -152,19 +267,17 @@ class NoteCommands(commands.Cog):
         """
         Edit a mod action or note on a users /search history.
 
-        This is a destructive action and will only change the original user
-        note. It should primarily be used for adding additional details
-        and correct English errors.
-
-        A history of edits is not maintained and will only show the
-        latest edited message.
+        It should primarily be used for adding additional details and
+        correct English errors. /search only shows the latest message but
+        every edit is kept in mod_log_revisions and can be viewed with
+        /loghistory.
         """
-        # TODO: Add some sort of support for history or editing mods.
         await ctx.defer()
 
         db = database.Database().get()
         mod_log = db["mod_logs"].find_one(id=id)
         if not mod_log:
+            db.close()
             return await embeds.error_message(ctx=ctx, description="Could not find a log with that ID!")
 
         user = await self.bot.fetch_user(mod_log["user_id"])
@@ -179,13 +292,66 @@ class NoteCommands(commands.Cog):
             ],
         )
 
-        mod_log["reason"] = note
-        db["mod_logs"].update(mod_log, ["id"])
+        # The revision is appended in the same transaction as the single-column update.
+        db.begin()
+        db["mod_log_revisions"].insert(
+            dict(
+                log_id=id,
+                editor_id=ctx.author.id,
+                timestamp=int(time.time()),
+                old_reason=mod_log["reason"],
+                new_reason=note,
+            )
+        )
+        db["mod_logs"].update(dict(id=id, reason=note), ["id"])
         db.commit()
         db.close()
 
         await ctx.send_followup(embed=embed)
 
+    @slash_command(name="loghistory", guild_ids=config.guild_ids)
+    @commands.has_role(config.roles.staff)
+    async def log_history(
+        self,
+        ctx: context.ApplicationContext,
+        id: Option(int, description="The ID of the log or note to show the edit history of", required=True),
+    ) -> None:
+        """
+        Show every edit made to a mod action or note with /editlog, oldest
+        first, including who made the edit and when.
+        """
+        await ctx.defer()
+
+        db = database.Database().get()
+        mod_log = db["mod_logs"].find_one(id=id)
+        revisions = list(db["mod_log_revisions"].find(log_id=id, order_by="id")) if mod_log else []
+        db.close()
+
+        if not mod_log:
+            return await embeds.error_message(ctx=ctx, description="Could not find a log with that ID!")
+
+        if not revisions:
+            return await embeds.error_message(ctx=ctx, description=f"Log #{id} has never been edited.")
+
+        lines = [f"**Original:** {revisions[0]['old_reason']}"]
+        for number, revision in enumerate(revisions, start=1):
+            lines.append(
+                f"**Revision {number}:** <t:{revision['timestamp']}:F> by <@!{revision['editor_id']}>\n"
+                f"{revision['new_reason']}"
+            )
+
+        embed = embeds.make_embed(title=f"Edit history: log #{id}", color=discord.Color.blurple())
+
+        await LinePaginator.paginate(
+            lines=lines,
+            ctx=ctx,
+            embed=embed,
+            max_lines=4,
+            max_size=2000,
+            timeout=120,
+            restrict_to_user=ctx.author,
+        )
+
 
 def setup(bot: commands.Bot) -> None:
     bot.add_cog(NoteCommands(bot))
@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import re
+from datetime import timedelta
 
 import discord
 from discord.commands import Option, context, slash_command
@@ -6,70 +9,179 @@ from discord.ext import commands
 
 from chiya import config
 from chiya.utils import embeds
+from chiya.utils.purge import PurgeFilter, PurgeJob
+from chiya.utils.timeparse import parse_duration
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles", "categories")
+
+CHANNEL_REGEX = re.compile(r"\d{15,20}")
+MAX_PURGE = 5000
+PROGRESS_INTERVAL = 3
+
+
+class PurgeCancelButton(discord.ui.View):
+    def __init__(self, author: discord.Member, job: PurgeJob) -> None:
+        super().__init__(timeout=None)
+        self.author = author
+        self.job = job
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger)
+    async def cancel(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        """
+        Cancel the running purge.
+        """
+        await interaction.response.edit_message(view=None)
+        self.job.cancel()
+        self.stop()
+
 
 class PurgeCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
-    async def can_purge_messages(self, ctx: context.ApplicationContext) -> bool:
+    def can_purge_messages(self, ctx: context.ApplicationContext, channel: discord.TextChannel) -> bool:
         """
         Check used by purge function to make sure that the moderation,
         development, logs, and tickets categories can't be purged for
         security reasons.
         """
-        if ctx.author.id == ctx.guild.owner.id:
+        if ctx.author.id == ctx.guild.owner_id:
             return True
 
-        if ctx.channel.category_id in [
-            config["categories"]["moderation"],
-            config["categories"]["development"],
-            config["categories"]["logs"],
-            config["categories"]["tickets"],
-        ]:
+        if channel.category_id in config.categories.protected:
             return False
 
         return True
 
-    @slash_command(guild_ids=config["guild_ids"], description="Purge the last X amount of messages")
-    @commands.has_role(config["roles"]["staff"])
+    def make_progress_embed(
+        self,
+        ctx: context.ApplicationContext,
+        job: PurgeJob,
+        reason: str,
+        finished: bool = False,
+    ) -> discord.Embed:
+        """
+        Builds the embed showing the per channel progress of a purge. Once
+        finished, channels that were not completed show where to resume.
+        """
+        if job.cancelled:
+            title, color = "Purge cancelled", discord.Color.dark_grey()
+        elif finished:
+            title, color = "Purged messages", discord.Color.red()
+        else:
+            title, color = "Purging messages...", discord.Color.orange()
+
+        embed = embeds.make_embed(
+            title=title,
+            description=f"{ctx.author.mention} purged {job.deleted} {'message' if job.deleted == 1 else 'messages'}.",
+            thumbnail_url="https://i.imgur.com/EDy6jCp.png",
+            color=color,
+            fields=[{"name": "Reason:", "value": reason, "inline": False}],
+        )
+
+        for progress in job.progress[:20]:
+            value = f"Deleted {progress.deleted} of {progress.scanned} scanned"
+            if progress.failed:
+                value += f", {progress.failed} failed"
+            if finished and not progress.done and progress.resume_id:
+                value += f"\nResume with `before:{progress.resume_id}`"
+            embed.add_field(name=f"#{progress.channel.name}", value=value, inline=True)
+
+        return embed
+
+    @slash_command(guild_ids=config.guild_ids, description="Purge messages matching the given filters")
+    @commands.has_role(config.roles.staff)
     async def purge(
         self,
         ctx: context.ApplicationContext,
-        amount: Option(int, description="The amount of messages to be purged", required=True),
+        amount: Option(int, description="The amount of messages to be purged per channel", required=True),
         reason: Option(str, description="The reason why the messages are being purged", required=True),
+        channels: Option(str, description="Channels to purge, defaults to the current one", required=False),
+        user: Option(discord.Member, description="Only purge messages from this member", required=False),
+        pattern: Option(str, description="Only purge messages matching this regular expression", required=False),
+        attachments: Option(bool, description="Only purge messages with attachments", required=False),
+        within: Option(str, description="Only purge messages sent within this duration, e.g. 2h", required=False),
+        before: Option(str, description="Message ID to resume a previous purge from", required=False),
     ) -> None:
         """
-        Removes the last X amount of messages in bulk.
+        Removes up to X messages matching the filters from one or more
+        channels, newest first.
 
-        Capped at a maximum of 100 messages per command invoke to avoid
-        accidents wiping out large chunks of messages.
+        History is streamed and deleted in bulk batches while a single
+        progress message is edited, which also has a button to cancel the
+        purge. Pinned messages are never purged.
 
         Cannot be used in the moderation, development, logs, or archive
         categories for security reasons.
         """
-        await ctx.defer()
+        await ctx.defer(ephemeral=True)
 
-        if not await self.can_purge_messages(ctx):
-            return await embeds.error_message(ctx=ctx, description="You cannot use that command in this category.")
+        if len(reason) > 1024:
+            return await embeds.error_message(ctx=ctx, description="Reason must be less than 1024 characters.")
 
-        if len(reason) > 4096:
-            return await embeds.error_message(ctx=ctx, description="Reason must be less than 4096 characters.")
+        targets = [ctx.channel]
+        if channels:
+            targets = [ctx.guild.get_channel(int(channel_id)) for channel_id in CHANNEL_REGEX.findall(channels)]
+            targets = [channel for channel in dict.fromkeys(targets) if isinstance(channel, discord.TextChannel)]
+            if not targets:
+                return await embeds.error_message(ctx=ctx, description="No valid text channels were given.")
 
-        amount = 100 if amount > 100 else amount
+        if not all(self.can_purge_messages(ctx, channel) for channel in targets):
+            return await embeds.error_message(ctx=ctx, description="You cannot use that command in this category.")
 
-        embed = embeds.make_embed(
-            title="Purged messages",
-            description=f"{ctx.author.mention} purged {amount} {'message' if amount == 1 else 'messages'}.",
-            thumbnail_url="https://i.imgur.com/EDy6jCp.png",
-            color=discord.Color.red(),
-            fields=[{"name": "Reason:", "value": reason, "inline": False}],
+        compiled = None
+        if pattern:
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                return await embeds.error_message(ctx=ctx, description="The pattern is not a valid regular expression.")
+
+        after = None
+        if within:
+            parsed = parse_duration(within)
+            if not parsed:
+                return await embeds.error_message(ctx=ctx, description="The duration must look like `2h` or `1d12h`.")
+            after = discord.utils.utcnow() - timedelta(seconds=parsed[0])
+
+        if before and not before.isdigit():
+            return await embeds.error_message(ctx=ctx, description="The resume point must be a message ID.")
+
+        # Starting from the interaction keeps the progress message out of the purge and needs no cached message.
+        job = PurgeJob(
+            channels=targets,
+            purge_filter=PurgeFilter(
+                author_id=user.id if user else None,
+                pattern=compiled,
+                attachments=bool(attachments),
+                after=after,
+            ),
+            limit=max(1, min(amount, MAX_PURGE)),
+            before=discord.Object(id=int(before) if before else ctx.interaction.id),
+            reason=reason,
         )
-        await ctx.channel.purge(limit=amount, before=ctx.channel.last_message.created_at, bulk=True)
-        await ctx.send_followup(embed=embed)
+
+        view = PurgeCancelButton(ctx.author, job)
+        message = await ctx.channel.send(embed=self.make_progress_embed(ctx, job, reason), view=view)
+        await ctx.send_followup(f"Purge started in {len(targets)} channel(s).", ephemeral=True)
+
+        runner = asyncio.create_task(job.run())
+        try:
+            while not runner.done():
+                await asyncio.wait({runner}, timeout=PROGRESS_INTERVAL)
+                if not runner.done():
+                    await message.edit(embed=self.make_progress_embed(ctx, job, reason))
+            await runner
+        finally:
+            view.stop()
+            await message.edit(embed=self.make_progress_embed(ctx, job, reason, finished=True), view=None)
+
+        log.info(f"{ctx.author} purged {job.deleted} messages from {len(targets)} channel(s)")
 
 
 def setup(bot: commands.Bot) -> None:
@@ -0,0 +1,357 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord.commands import Option, context, slash_command
+from discord.ext import commands
+
+from chiya import config
+from chiya.utils import embeds
+from chiya.utils.helpers import can_action_member
+from chiya.utils.modlogs import log_mod_action
+from chiya.utils.timeparse import get_user_timezone, parse_time
+
+
+log = logging.getLogger(__name__)
+
+REQUIRED_CONFIG = ("roles",)
+
+USER_ID_REGEX = re.compile(r"\d{15,20}")
+
+# py-cord already waits out each route's rate limit bucket, this only bounds how many requests queue up at once.
+MAX_CONCURRENCY = 5
+MAX_TARGETS = 1000
+PROGRESS_INTERVAL = 2
+
+
+class MassActionButtons(discord.ui.View):
+    def __init__(self, author: discord.Member) -> None:
+        super().__init__(timeout=60)
+        self.author = author
+        self.value = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    @discord.ui.button(label="Confirm", style=discord.ButtonStyle.danger)
+    async def confirm(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        """
+        Confirm running the mass action.
+        """
+        await interaction.response.edit_message(view=None)
+        self.value = True
+        self.stop()
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        """
+        Cancel the mass action.
+        """
+        await interaction.response.edit_message(view=None)
+        self.value = False
+        self.stop()
+
+
+def select_members(
+    guild: discord.Guild,
+    joined_within: int = None,
+    account_age: int = None,
+    name_pattern: re.Pattern = None,
+) -> list:
+    """
+    Returns the cached members matching every given filter: joined in the
+    last `joined_within` minutes, account younger than `account_age` days
+    and name or nickname matching `name_pattern`.
+    """
+    if joined_within is None and account_age is None and name_pattern is None:
+        return []
+
+    now = datetime.now(tz=timezone.utc)
+    joined_after = now - timedelta(minutes=joined_within) if joined_within is not None else None
+    created_after = now - timedelta(days=account_age) if account_age is not None else None
+
+    members = []
+    for member in guild.members:
+        if joined_after and (not member.joined_at or member.joined_at < joined_after):
+            continue
+        if created_after and member.created_at < created_after:
+            continue
+        if name_pattern and not (name_pattern.search(member.name) or name_pattern.search(member.display_name)):
+            continue
+        members.append(member)
+
+    return members
+
+
+class RaidCommands(commands.Cog):
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+
+    async def collect_targets(
+        self,
+        ctx: context.ApplicationContext,
+        ids: str,
+        joined_within: int,
+        account_age: int,
+        name_pattern: str,
+        members_only: bool,
+    ) -> tuple:
+        """
+        Resolves the given IDs and filters into the list of targets the
+        invoking mod can action and the number of skipped ones. Returns None
+        after sending an error if the input was invalid.
+        """
+        pattern = None
+        if name_pattern:
+            try:
+                pattern = re.compile(name_pattern, re.IGNORECASE)
+            except re.error:
+                await embeds.error_message(ctx=ctx, description="The name pattern is not a valid regular expression.")
+                return None
+
+        targets = {member.id: member for member in select_members(ctx.guild, joined_within, account_age, pattern)}
+        for user_id in dict.fromkeys(int(user_id) for user_id in USER_ID_REGEX.findall(ids or "")):
+            if user_id in targets:
+                continue
+            member = ctx.guild.get_member(user_id)
+            if member:
+                targets[user_id] = member
+            elif not members_only:
+                # Users who already left can still be banned by ID.
+                targets[user_id] = discord.Object(id=user_id)
+
+        if not targets:
+            await embeds.error_message(ctx=ctx, description="No users matched the given IDs or filters.")
+            return None
+
+        actionable = []
+        for target in targets.values():
+            if target.id == ctx.author.id:
+                continue
+            if isinstance(target, discord.Member) and not await can_action_member(ctx=ctx, member=target):
+                continue
+            actionable.append(target)
+
+        if len(actionable) > MAX_TARGETS:
+            await embeds.error_message(
+                ctx=ctx,
+                description=f"{len(actionable)} users matched, narrow the filters down to at most {MAX_TARGETS}.",
+            )
+            return None
+
+        return actionable, len(targets) - len(actionable)
+
+    async def confirm(self, ctx: context.ApplicationContext, embed: discord.Embed, targets: list) -> discord.Message:
+        """
+        Previews the targets and waits for the invoking mod to confirm.
+        Returns the message to report progress on, or None if cancelled.
+        """
+        preview = ", ".join(f"<@{target.id}>" for target in targets[:30])
+        if len(targets) > 30:
+            preview += f" and {len(targets) - 30} more"
+        embed.add_field(name="Targets:", value=preview, inline=False)
+
+        view = MassActionButtons(ctx.author)
+        message = await ctx.send_followup(embed=embed, view=view)
+        await view.wait()
+
+        if not view.value:
+            embed.color = discord.Color.dark_grey()
+            embed.set_footer(text="Cancelled.")
+            await message.edit(embed=embed, view=None)
+            return None
+
+        embed.clear_fields()
+        return message
+
+    async def execute(self, message: discord.Message, embed: discord.Embed, targets: list, action) -> tuple:
+        """
+        Runs the action against every target with bounded concurrency while
+        editing a single progress embed. Returns the actioned and failed
+        targets.
+        """
+        actioned, failed = [], []
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+        async def run(target) -> None:
+            async with semaphore:
+                try:
+                    await action(target)
+                except discord.HTTPException as e:
+                    log.warning(f"Mass action failed for {target.id}: {e}")
+                    failed.append(target)
+                else:
+                    actioned.append(target)
+
+        pending = {asyncio.create_task(run(target)) for target in targets}
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=PROGRESS_INTERVAL)
+            if pending:
+                embed.set_footer(text=f"Progress: {len(actioned) + len(failed)}/{len(targets)}")
+                await message.edit(embed=embed)
+
+        return actioned, failed
+
+    async def report(
+        self,
+        message: discord.Message,
+        embed: discord.Embed,
+        actioned: list,
+        failed: list,
+        skipped: int,
+        started: float,
+    ) -> None:
+        """
+        Replaces the progress footer with the final counts.
+        """
+        embed.add_field(name="Actioned:", value=len(actioned), inline=True)
+        embed.add_field(name="Skipped:", value=skipped, inline=True)
+        embed.add_field(name="Failed:", value=len(failed), inline=True)
+        if failed:
+            value = ", ".join(f"<@{target.id}>" for target in failed[:30])
+            embed.add_field(name="Failed users:", value=value, inline=False)
+        embed.set_footer(text=f"Finished in {time.monotonic() - started:.1f}s")
+        await message.edit(embed=embed)
+
+    @slash_command(guild_ids=config.guild_ids, description="Ban many users at once during a raid")
+    @commands.has_role(config.roles.staff)
+    async def massban(
+        self,
+        ctx: context.ApplicationContext,
+        reason: Option(str, description="Reason why the users are being banned", required=True),
+        ids: Option(str, description="User IDs separated by spaces or commas", required=False),
+        joined_within: Option(int, description="Members who joined in the last N minutes", min_value=1, required=False),
+        account_age: Option(int, description="Accounts younger than N days", min_value=1, required=False),
+        name_pattern: Option(str, description="Regular expression matched against names", required=False),
+        daystodelete: Option(
+            int,
+            description="Days worth of messages to delete from the users, up to 7",
+            choices=[1, 2, 3, 4, 5, 6, 7],
+            required=False,
+        ),
+    ) -> None:
+        """
+        Ban every user given by ID plus every member matching all of the
+        given filters, after the invoking mod confirms the preview.
+
+        Unlike /ban, no direct message is sent since these are meant for raid
+        accounts. Bans run concurrently and are logged through the batched
+        mod log writer.
+        """
+        await ctx.defer()
+
+        if len(reason) > 1024:
+            return await embeds.error_message(ctx=ctx, description="Reason must be less than 1024 characters.")
+
+        result = await self.collect_targets(ctx, ids, joined_within, account_age, name_pattern, members_only=False)
+        if not result:
+            return
+        targets, skipped = result
+
+        embed = embeds.make_embed(
+            ctx=ctx,
+            author=True,
+            title=f"Mass banning {len(targets)} users",
+            description=f"{len(targets)} users are being banned by {ctx.author.mention} for: {reason}",
+            thumbnail_url="https://i.imgur.com/l0jyxkz.png",
+            color=discord.Color.red(),
+        )
+        message = await self.confirm(ctx, embed, targets)
+        if not message:
+            return
+
+        async def ban(target) -> None:
+            await ctx.guild.ban(target, reason=reason, delete_message_days=daystodelete or 0)
+            log_mod_action(user_id=target.id, mod_id=ctx.author.id, reason=reason, type="ban")
+
+        started = time.monotonic()
+        actioned, failed = await self.execute(message, embed, targets, ban)
+        await self.report(message, embed, actioned, failed, skipped, started)
+        log.info(f"{ctx.author} mass banned {len(actioned)} users ({len(failed)} failed)")
+
+    @slash_command(guild_ids=config.guild_ids, description="Time out many members at once during a raid")
+    @commands.has_any_role(config.roles.staff, config.roles.chat_mod)
+    async def masstimeout(
+        self,
+        ctx: context.ApplicationContext,
+        reason: Option(str, description="Reason why the members are being timed out", required=True),
+        duration: Option(str, description="The length of time the members will be timed out for", required=True),
+        ids: Option(str, description="User IDs separated by spaces or commas", required=False),
+        joined_within: Option(int, description="Members who joined in the last N minutes", min_value=1, required=False),
+        account_age: Option(int, description="Accounts younger than N days", min_value=1, required=False),
+        name_pattern: Option(str, description="Regular expression matched against names", required=False),
+    ) -> None:
+        """
+        Time out every member given by ID plus every member matching all of
+        the given filters, after the invoking mod confirms the preview.
+
+        Members who are already timed out are skipped. Like /massban, no
+        direct message is sent.
+        """
+        await ctx.defer()
+
+        if len(reason) > 1024:
+            return await embeds.error_message(ctx=ctx, description="Reason must be less than 1024 characters.")
+
+        parsed = parse_time(duration, tz=await get_user_timezone(ctx.author.id))
+        if not parsed:
+            return await embeds.error_message(
+                ctx=ctx,
+                description=(
+                    "Duration syntax: `y#mo#w#d#h#m#s` (year, month, week, day, hour, min, sec)\n"
+                    "You can specify up to all seven but you only need one."
+                ),
+            )
+
+        if parsed.end_time - time.time() >= 2419200:
+            return await embeds.error_message(ctx=ctx, description="Timeout duration cannot exceed 28 days.")
+
+        result = await self.collect_targets(ctx, ids, joined_within, account_age, name_pattern, members_only=True)
+        if not result:
+            return
+        targets, skipped = result
+        active = [member for member in targets if not member.timed_out]
+        skipped += len(targets) - len(active)
+
+        if not active:
+            return await embeds.error_message(ctx=ctx, description="Every matching member is already timed out.")
+
+        embed = embeds.make_embed(
+            ctx=ctx,
+            author=True,
+            title=f"Mass timing out {len(active)} members",
+            description=f"{len(active)} members are being timed out by {ctx.author.mention} for: {reason}",
+            thumbnail_url="https://i.imgur.com/rHtYWIt.png",
+            color=discord.Color.red(),
+            fields=[{"name": "Duration:", "value": parsed.description, "inline": False}],
+        )
+        message = await self.confirm(ctx, embed, active)
+        if not message:
+            return
+        embed.add_field(name="Duration:", value=parsed.description, inline=False)
+
+        until = datetime.fromtimestamp(parsed.end_time, tz=timezone.utc)
+
+        async def timeout(member: discord.Member) -> None:
+            await member.timeout(until=until, reason=reason)
+            log_mod_action(
+                mute_until=parsed.end_time,
+                user_id=member.id,
+                mod_id=ctx.author.id,
+                reason=reason,
+                duration=parsed.description,
+                type="mute",
+            )
+
+        started = time.monotonic()
+        actioned, failed = await self.execute(message, embed, active, timeout)
+        await self.report(message, embed, actioned, failed, skipped, started)
+        log.info(f"{ctx.author} mass timed out {len(actioned)} members ({len(failed)} failed)")
+
+
+def setup(bot: commands.Bot) -> None:
+    bot.add_cog(RaidCommands(bot))
+    log.info("Commands loaded: raid")
@@ -1,19 +1,83 @@
-import asyncio
 import logging
+import re
 
+import dataset
 import discord
 from discord.commands import Option, SlashCommandGroup, context, slash_command
 from discord.ext import commands
+from sqlalchemy import and_
 
 from chiya import config, database
 from chiya.utils import embeds
-from chiya.utils.helpers import get_duration
-from chiya.utils.pagination import LinePaginator
+from chiya.utils.pagination import ButtonPaginator, KeysetPageSource
+from chiya.utils.recurrence import describe_recurrence, parse_recurrence
+from chiya.utils.timeparse import get_user_timezone, parse_duration, parse_time, set_user_timezone
 
 
 log = logging.getLogger(__name__)
 
 
+def parse_reminder_ids(reminder_ids: str) -> list:
+    """
+    Extracts up to 100 reminder IDs from a space or comma separated string.
+    """
+    return [int(reminder_id) for reminder_id in re.findall(r"\d+", reminder_ids)][:100]
+
+
+def format_reminder(result: dict) -> str:
+    """
+    Formats a single remind_me row for the /reminder list output.
+    """
+    reminder_string = f"**ID: {result['id']}**\n**Alert on:** <t:{result['date_to_remind']}:F>\n"
+    if result.get("recurrence"):
+        reminder_string += f"**Repeats:** {describe_recurrence(result['recurrence'])}\n"
+    return reminder_string + f"**Message: **{result['message']}"
+
+
+def update_reminders(db: dataset.Database, author_id: int, values: dict, ids: list = None) -> int:
+    """
+    Updates every unsent reminder of the author, or only the given IDs, in a
+    single UPDATE statement. Returns the number of reminders updated.
+    """
+    if ids is not None and not ids:
+        return 0
+
+    table = db["remind_me"].table
+    clause = and_(table.c.author_id == author_id, table.c.sent.is_(False))
+    if ids:
+        clause = and_(clause, table.c.id.in_(ids))
+
+    return db.executable.execute(table.update().where(clause).values(**values)).rowcount
+
+
+class ClearRemindersButtons(discord.ui.View):
+    def __init__(self, author: discord.Member) -> None:
+        super().__init__(timeout=60)
+        self.author = author
+        self.value = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    @discord.ui.button(label="Clear", style=discord.ButtonStyle.danger)
+    async def confirm(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        """
+        Confirm clearing all the reminders.
+        """
+        await interaction.response.edit_message(view=None)
+        self.value = True
+        self.stop()
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        """
+        Cancel clearing the reminders.
+        """
+        await interaction.response.edit_message(view=None)
+        self.value = False
+        self.stop()
+
+
 class ReminderCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
@@ -21,15 +85,24 @@ class ReminderCommands(commands.Cog):
     reminder = SlashCommandGroup(
         "reminder",
         "Sets a reminder note to be sent at a future date",
-        guild_ids=config["guild_ids"],
+        guild_ids=config.guild_ids,
     )
 
-    @slash_command(guild_ids=config["guild_ids"], description="Set a reminder")
+    @slash_command(guild_ids=config.guild_ids, description="Set a reminder")
     async def remindme(
         self,
         ctx: context.ApplicationContext,
-        duration: Option(str, description="Amount of time until the reminder is sent", required=True),
+        duration: Option(
+            str,
+            description="Amount of time until the reminder is sent, or when, e.g. 2h30m or tomorrow 9am",
+            required=True,
+        ),
         message: Option(str, description="Reminder message", required=True),
+        repeat: Option(
+            str,
+            description="Repeat the reminder, e.g. every 1d, daily at 09:00 or mon,thu at 18:30 (UTC)",
+            required=False,
+        ),
     ) -> None:
         """
         Creates a reminder message that will be sent at the specified time.
@@ -37,18 +110,34 @@ class ReminderCommands(commands.Cog):
         The reminder will be sent in the same channel that it was originally
         created at. If the channel no longer exists when the reminder is to
         be sent, it will attempt to send the reminder to the user in DMs.
+
+        Repeating reminders are stored as a single row with a compact
+        recurrence rule and are rescheduled in place after every delivery.
         """
         await ctx.defer()
 
-        duration_string, end_time = get_duration(duration=duration)
-        if not duration_string:
+        recurrence = parse_recurrence(repeat) if repeat else None
+        if repeat and not recurrence:
+            return await embeds.error_message(
+                ctx=ctx,
+                description=(
+                    "Repeat syntax: `every <duration>` (at least a minute) or `<days> at HH:MM` in UTC, "
+                    "where days are `daily`, `weekdays`, `weekends` or a list like `mon,wed,fri`."
+                ),
+            )
+
+        parsed = parse_time(duration, tz=await get_user_timezone(ctx.author.id))
+        if not parsed:
             return await embeds.error_message(
                 ctx=ctx,
                 description=(
                     "Duration syntax: `y#mo#w#d#h#m#s` (year, month, week, day, hour, min, sec)\n"
-                    "You can specify up to all seven but you only need one."
+                    "You can specify up to all seven but you only need one.\n"
+                    "Dates like `2026-12-01 18:00` or `tomorrow 9am` are also accepted, "
+                    "in the timezone set with `/reminder timezone`."
                 ),
             )
+        end_time = parsed.end_time
 
         db = database.Database().get()
         remind_id = db["remind_me"].insert(
@@ -58,6 +147,7 @@ class ReminderCommands(commands.Cog):
                 date_to_remind=end_time,
                 message=message,
                 sent=False,
+                recurrence=recurrence,
             )
         )
 
@@ -76,9 +166,30 @@ class ReminderCommands(commands.Cog):
                 {"name": "Message:", "value": message, "inline": False},
             ],
         )
+        if recurrence:
+            embed.add_field(name="Repeats:", value=describe_recurrence(recurrence), inline=False)
 
         await ctx.send_followup(embed=embed)
 
+    @reminder.command(name="timezone", description="Set the timezone used to read reminder and mute dates")
+    async def timezone(
+        self,
+        ctx: context.ApplicationContext,
+        timezone: Option(str, description="Your timezone, e.g. Europe/London or America/New_York", required=True),
+    ) -> None:
+        """
+        Set the timezone absolute dates like "tomorrow 9am" are read in.
+        """
+        await ctx.defer(ephemeral=True)
+
+        if not await set_user_timezone(ctx.author.id, timezone):
+            return await embeds.error_message(
+                ctx=ctx,
+                description="Unknown timezone, use a name from the tz database such as `Europe/London`.",
+            )
+
+        await embeds.success_message(ctx=ctx, description=f"Your timezone was set to `{timezone}`.")
+
     @reminder.command(name="edit", descrption="Edit an existing reminder")
     async def edit(
         self,
@@ -130,17 +241,13 @@ class ReminderCommands(commands.Cog):
         """List your reminders."""
         await ctx.defer()
 
-        db = database.Database().get()
-        results = db["remind_me"].find(sent=False, author_id=ctx.author.id)
-        reminders = []
-        for result in results:
-            reminders.append(
-                (
-                    f"**ID: {result['id']}**\n"
-                    f"**Alert on:** <t:{result['date_to_remind']}:F>\n"
-                    f"**Message: **{result['message']}"
-                )
-            )
+        source = KeysetPageSource(
+            "remind_me",
+            formatter=format_reminder,
+            descending=False,
+            sent=False,
+            author_id=ctx.author.id,
+        )
 
         embed = embeds.make_embed(
             ctx=ctx,
@@ -150,59 +257,107 @@ class ReminderCommands(commands.Cog):
             color=discord.Color.blurple(),
         )
 
-        await LinePaginator.paginate(
-            reminders,
-            ctx=ctx,
-            embed=embed,
-            max_lines=5,
-            max_size=2000,
-            restrict_to_user=ctx.author,
-        )
-
-        db.close()
+        await ButtonPaginator(source, embed=embed, restrict_to_user=ctx.author).start(ctx)
 
-    @reminder.command(name="delete", description="Delete an existing reminder")
+    @reminder.command(name="delete", description="Delete one or more existing reminders")
     async def delete(
         self,
         ctx: context.ApplicationContext,
-        reminder_id: Option(int, description="The ID of the reminder to be deleted", required=True),
+        reminder_ids: Option(
+            str,
+            description="The IDs of the reminders to be deleted, separated by spaces",
+            required=True,
+        ),
     ) -> None:
         """
-        Delete a reminder.
+        Delete one or more reminders with a single update.
         """
         await ctx.defer()
 
+        ids = parse_reminder_ids(reminder_ids)
+        if not ids:
+            return await embeds.error_message(ctx=ctx, description="Invalid ID.")
+
         db = database.Database().get()
+        db.begin()
+        results = list(db["remind_me"].find(id=ids, author_id=ctx.author.id, sent=False))
+        update_reminders(db, author_id=ctx.author.id, ids=[result["id"] for result in results], values=dict(sent=True))
+        db.commit()
+        db.close()
 
-        table = db["remind_me"]
-        result = table.find_one(id=reminder_id)
+        if not results:
+            return await embeds.error_message(ctx=ctx, description="None of those reminders are yours or exist.")
 
-        if not result:
-            return await embeds.error_message(ctx=ctx, description="Invalid ID.")
+        embed = embeds.make_embed(
+            ctx=ctx,
+            author=True,
+            title="Reminder deleted" if len(results) == 1 else f"{len(results)} reminders deleted",
+            description="Your reminder was deleted" if len(results) == 1 else "Your reminders were deleted",
+            thumbnail_url="https://i.imgur.com/03bmvBX.png",
+            color=discord.Color.red(),
+            fields=[
+                {"name": f"ID: {result['id']}", "value": result["message"][:1024], "inline": False}
+                for result in results[:25]
+            ],
+        )
+        await ctx.send_followup(embed=embed)
 
-        if result["author_id"] != ctx.author.id:
-            return await embeds.error_message(ctx=ctx, description="This reminder is not yours.")
+    @reminder.command(name="snooze", description="Push back one or more existing reminders")
+    async def snooze(
+        self,
+        ctx: context.ApplicationContext,
+        reminder_ids: Option(
+            str,
+            description="The IDs of the reminders to be snoozed, separated by spaces",
+            required=True,
+        ),
+        duration: Option(str, description="Amount of time to push the reminders back by", required=True),
+    ) -> None:
+        """
+        Push back the alert time of one or more reminders by the same
+        duration with a single update.
+        """
+        await ctx.defer()
 
-        if result["sent"]:
-            return await embeds.error_message(ctx=ctx, description="This reminder has already been deleted.")
+        ids = parse_reminder_ids(reminder_ids)
+        if not ids:
+            return await embeds.error_message(ctx=ctx, description="Invalid ID.")
+
+        parsed = parse_duration(duration)
+        if not parsed:
+            return await embeds.error_message(
+                ctx=ctx,
+                description=(
+                    "Duration syntax: `y#mo#w#d#h#m#s` (year, month, week, day, hour, min, sec)\n"
+                    "You can specify up to all seven but you only need one."
+                ),
+            )
 
-        data = dict(id=reminder_id, sent=True)
-        table.update(data, ["id"])
+        delta, duration_string = parsed
 
+        db = database.Database().get()
+        table = db["remind_me"].table
+        snoozed = update_reminders(
+            db,
+            author_id=ctx.author.id,
+            ids=ids,
+            values=dict(date_to_remind=table.c.date_to_remind + delta),
+        )
         db.commit()
         db.close()
 
+        if not snoozed:
+            return await embeds.error_message(ctx=ctx, description="None of those reminders are yours or exist.")
+
         embed = embeds.make_embed(
             ctx=ctx,
             author=True,
-            title="Reminder deleted",
-            description="Your reminder was deleted",
-            thumbnail_url="https://i.imgur.com/03bmvBX.png",
-            color=discord.Color.red(),
-            fields=[
-                {"name": "ID:", "value": str(reminder_id), "inline": False},
-                {"name": "Message: ", "value": result["message"], "inline": False},
-            ],
+            title="Reminders snoozed",
+            description=(
+                f"{snoozed} {'reminder was' if snoozed == 1 else 'reminders were'} pushed back by {duration_string}."
+            ),
+            thumbnail_url="https://i.imgur.com/VZV64W0.png",
+            color=discord.Color.blurple(),
         )
         await ctx.send_followup(embed=embed)
 
@@ -210,43 +365,34 @@ class ReminderCommands(commands.Cog):
     async def clear(self, ctx: context.ApplicationContext) -> None:
         """
         Clears all reminders.
+
+        The database is only touched once the user confirmed, and all the
+        reminders are cleared with a single update.
         """
         await ctx.defer()
 
-        db = database.Database().get()
-
         confirm_embed = embeds.make_embed(
-            description=f"{ctx.author.mention}, clear all your reminders? (yes/no/y/n)",
+            description=f"{ctx.author.mention}, clear all your reminders?",
             color=discord.Color.blurple(),
         )
 
-        await ctx.send_followup(embed=confirm_embed)
-
-        def check(message):
-            return (
-                message.author == ctx.author
-                and message.channel == ctx.channel
-                and message.content.lower() in ("yes", "no", "y", "n")
-            )
+        view = ClearRemindersButtons(author=ctx.author)
+        await ctx.send_followup(embed=confirm_embed, view=view)
 
-        try:
-            msg = await self.bot.wait_for("message", timeout=60, check=check)
-            if msg.content.lower() in ("no", "n"):
-                db.close()
-                embed = embeds.make_embed(
-                    description=f"{ctx.author.mention}, your request has been canceled.",
-                    color=discord.Color.blurple(),
-                )
-                return await ctx.send_followup(embed=embed)
-        except asyncio.TimeoutError:
-            db.close()
+        if await view.wait():
             return await embeds.error_message(ctx, description=f"{ctx.author.mention}, your request has timed out.")
 
-        remind_me = db["remind_me"]
-        results = remind_me.find(author_id=ctx.author.id, sent=False)
-        for result in results:
-            updated_data = dict(id=result["id"], sent=True)
-            remind_me.update(updated_data, ["id"])
+        if not view.value:
+            embed = embeds.make_embed(
+                description=f"{ctx.author.mention}, your request has been canceled.",
+                color=discord.Color.blurple(),
+            )
+            return await ctx.send_followup(embed=embed)
+
+        db = database.Database().get()
+        update_reminders(db, author_id=ctx.author.id, values=dict(sent=True))
+        db.commit()
+        db.close()
 
         embed = embeds.make_embed(
             description=f"{ctx.author.mention}, all your reminders have been cleared.",
@@ -255,9 +401,6 @@ class ReminderCommands(commands.Cog):
 
         await ctx.send_followup(embed=embed)
 
-        db.commit()
-        db.close()
-
 
 def setup(bot: commands.Bot) -> None:
     bot.add_cog(ReminderCommands(bot))
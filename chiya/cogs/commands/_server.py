@@ -6,10 +6,13 @@ from discord.ext import commands
 
 from chiya import config
 from chiya.utils import embeds
+from config import RESTART_SECTIONS, ConfigError
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles",)
+
 
 class ServerCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
@@ -19,11 +22,11 @@ class ServerCommands(commands.Cog):
     server = SlashCommandGroup(
         name="server",
         description="Server management commands",
-        guild_ids=config["guild_ids"],
+        guild_ids=config.guild_ids,
     )
 
     @server.command(name="pop", description="Gets the current server population")
-    @commands.has_role(config["roles"]["staff"])
+    @commands.has_role(config.roles.staff)
     async def pop(self, ctx: context.ApplicationContext) -> None:
         """
         Send the current member count of the server.
@@ -32,7 +35,7 @@ class ServerCommands(commands.Cog):
         await ctx.send_followup(ctx.guild.member_count)
 
     @server.command(name="boosters", description="List all the server boosters")
-    @commands.has_role(config["roles"]["staff"])
+    @commands.has_role(config.roles.staff)
     async def boosters(self, ctx: context.ApplicationContext) -> None:
         """
         Send an embed with all current server boosters.
@@ -48,6 +51,35 @@ class ServerCommands(commands.Cog):
         )
         await ctx.send_followup(embed=embed)
 
+    @server.command(name="reload", description="Reload config.yml without restarting the bot")
+    @commands.is_owner()
+    async def reload(self, ctx: context.ApplicationContext) -> None:
+        """
+        Re-parses config.yml and applies it, notifying the cogs subscribed
+        to the changed sections. An invalid file is rejected and the
+        current config is kept.
+        """
+        await ctx.defer(ephemeral=True)
+
+        try:
+            changed = await config.reload()
+        except ConfigError as e:
+            return await embeds.error_message(ctx=ctx, description=f"config.yml is invalid:\n```{str(e)[:3900]}```")
+
+        if not changed:
+            return await embeds.warning_message(ctx=ctx, description="config.yml has no changes.")
+
+        restart = sorted({path.partition(".")[0] for path in changed} & RESTART_SECTIONS)
+        fields = [{"name": "Changed:", "value": "\n".join(f"`{path}`" for path in changed)[:1024], "inline": False}]
+        if restart:
+            fields.append(
+                {"name": "Needs a restart:", "value": ", ".join(f"`{section}`" for section in restart), "inline": False}
+            )
+
+        embed = embeds.make_embed(title="Reloaded config.yml", fields=fields, color=discord.Color.green())
+        await ctx.send_followup(embed=embed, ephemeral=True)
+        log.info(f"{ctx.author} reloaded config.yml")
+
 
 def setup(bot: commands.Bot) -> None:
     bot.add_cog(ServerCommands(bot))
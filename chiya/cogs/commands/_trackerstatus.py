@@ -1,11 +1,12 @@
 import logging
 
-import requests
+import aiohttp
 from discord.commands import slash_command, context, Option
 from discord.ext import commands, tasks
 
 from chiya import config
 from chiya.utils import embeds
+from chiya.utils.http import sessions
 
 
 log = logging.getLogger(__name__)
@@ -34,14 +35,11 @@ class TrackerStatusCommands(commands.Cog):
         """
         for tracker in trackers:
             try:
-                r = requests.get(url=f"https://{tracker}.trackerstatus.info/api/status/")
-                r.raise_for_status()
-            except (requests.exceptions.RequestException, requests.exceptions.HTTPError) as e:
+                async with sessions.session.get(url=f"https://{tracker}.trackerstatus.info/api/status/") as r:
+                    r.raise_for_status()
+                    self.cache[tracker] = await r.json(content_type=None)
+            except aiohttp.ClientError as e:
                 log.error(e)
-                pass
-
-            if r.status_code == 200:
-                self.cache[tracker] = r.json()
 
     def normalize_value(self, value):
         """
@@ -55,7 +53,7 @@ class TrackerStatusCommands(commands.Cog):
             case "0":
                 return "<:status_offline:596576752013279242> Offline"
 
-    @slash_command(guild_ids=config["guild_ids"], description="Get tracker uptime statuses")
+    @slash_command(guild_ids=config.guild_ids, description="Get tracker uptime statuses")
     async def trackerstatus(
         self,
         ctx: context.ApplicationContext,
@@ -1,23 +1,26 @@
 import logging
-import time
 
 import discord
 from discord.commands import Option, context, slash_command
 from discord.ext import commands
 
-from chiya import config, database
+from chiya import config
 from chiya.utils import embeds
+from chiya.utils.modlogs import format_summary, log_mod_action, summaries
+from chiya.utils.notifications import notifications
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles",)
+
 
 class WarnCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
-    @slash_command(guild_ids=config["guild_ids"], description="Warn the member")
-    @commands.has_role(config["roles"]["staff"])
+    @slash_command(guild_ids=config.guild_ids, description="Warn the member")
+    @commands.has_role(config.roles.staff)
     async def warn(
         self,
         ctx: context.ApplicationContext,
@@ -53,49 +56,23 @@ class WarnCommands(commands.Cog):
             color=discord.Color.gold(),
         )
 
-        try:
-            dm_embed = embeds.make_embed(
-                author=False,
-                title="Uh-oh, you've received a warning!",
-                description="If you believe this was a mistake, contact staff.",
-                image_url="https://i.imgur.com/rVf0mlG.gif",
-                color=discord.Color.blurple(),
-                fields=[
-                    {
-                        "name": "Server:",
-                        "value": f"[{ctx.guild.name}]({await ctx.guild.vanity_invite()})",
-                        "inline": True,
-                    },
-                    {"name": "Moderator:", "value": ctx.author.mention, "inline": True},
-                    {"name": "Reason:", "value": reason, "inline": False},
-                ],
-            )
-            await member.send(embed=dm_embed)
-        except discord.Forbidden:
-            embed.add_field(
-                name="Notice:",
-                value=(
-                    f"Unable to message {member.mention} about this action. "
-                    "This can be caused by the user not being in the server, "
-                    "having DMs disabled, or having the bot blocked."
-                ),
-            )
-
-        db = database.Database().get()
-        db["mod_logs"].insert(
-            dict(
-                user_id=member.id,
-                mod_id=ctx.author.id,
-                timestamp=int(time.time()),
-                reason=reason,
-                type="warn",
-            )
+        dm_embed = await embeds.make_dm_embed(
+            guild=ctx.guild,
+            title="Uh-oh, you've received a warning!",
+            description="If you believe this was a mistake, contact staff.",
+            image_url="https://i.imgur.com/rVf0mlG.gif",
+            fields=[
+                {"name": "Moderator:", "value": ctx.author.mention, "inline": True},
+                {"name": "Reason:", "value": reason, "inline": False},
+            ],
         )
+        delivery = notifications.send(member, dm_embed)
 
-        db.commit()
-        db.close()
+        embed.add_field(name="History:", value=format_summary(await summaries.get(member.id)), inline=False)
+        log_mod_action(user_id=member.id, mod_id=ctx.author.id, reason=reason, type="warn")
 
-        await ctx.send_followup(embed=embed)
+        message = await ctx.send_followup(embed=embed)
+        notifications.report(delivery, message, embed, member)
 
 
 def setup(bot: commands.Bot) -> None:
@@ -13,7 +13,7 @@ class GeneralCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
-    @slash_command(guild_ids=config["guild_ids"], description="Gets a users profile picture")
+    @slash_command(guild_ids=config.guild_ids, description="Gets a users profile picture")
     async def pfp(
         self,
         ctx: context.ApplicationContext,
@@ -55,10 +55,10 @@ class GeneralCommands(commands.Cog):
         await ctx.send_followup(embed=embed)
 
     # @slash_command(
-    #     guild_ids=config["guild_ids"],
+    #     guild_ids=config.guild_ids,
     #     description="Add vote reactions to a message.",
     # )
-    # @commands.has_role(config["roles"]["staff"])
+    # @commands.has_role(config.roles.staff)
     # async def vote(
     #     self,
     #     ctx: context.ApplicationContext,
@@ -84,15 +84,15 @@ class GeneralCommands(commands.Cog):
     #         messages = await ctx.channel.history(limit=1).flatten()
     #         message = messages[0]
 
-    #     await message.add_reaction(f":yes:{config['emoji']['yes']}")
-    #     await message.add_reaction(f":no:{config['emoji']['no']}")
+    #     await message.add_reaction(f":yes:{config.emoji.yes}")
+    #     await message.add_reaction(f":no:{config.emoji.no}")
     #     await embeds.success_message(ctx=ctx, description=f"Added votes to {message.jump_url}")
 
     # @slash_command(
-    #     guild_ids=config["guild_ids"],
+    #     guild_ids=config.guild_ids,
     #     description="Summarises a vote, and displays results.",
     # )
-    # @commands.has_role(config["roles"]["staff"])
+    # @commands.has_role(config.roles.staff)
     # async def vote_info(
     #     self,
     #     ctx: context.ApplicationContext,
@@ -113,9 +113,9 @@ class GeneralCommands(commands.Cog):
     #     no_reactions = None
 
     #     for reaction in message.reactions:
-    #         if reaction.emoji.id == config["emoji"]["yes"]:
+    #         if reaction.emoji.id == config.emoji.yes:
     #             yes_reactions = reaction
-    #         if reaction.emoji.id == config["emoji"]["no"]:
+    #         if reaction.emoji.id == config.emoji.no:
     #             no_reactions = reaction
 
     #     if not yes_reactions or not no_reactions:
@@ -127,7 +127,7 @@ class GeneralCommands(commands.Cog):
     #     yes_users = set(await yes_reactions.users().flatten())
     #     no_users = set(await no_reactions.users().flatten())
     #     both_users = yes_users.intersection(no_users)
-    #     role_staff = discord.utils.get(message.guild.roles, id=config["roles"]["staff"])
+    #     role_staff = discord.utils.get(message.guild.roles, id=config.roles.staff)
     #     staff_users = set(user for user in role_staff.members)
     #     skipped_users = staff_users.difference(yes_users.union(no_users))
 
@@ -140,8 +140,8 @@ class GeneralCommands(commands.Cog):
     #         ctx=ctx,
     #         author=True,
     #         title="Results of vote",
-    #         description=f"""<:yes:{config['emoji']['yes']}> - **{len(yes_users) - 1}** {" ".join(yes_users)}
-    #         <:no:{config['emoji']['no']}> - **{len(no_users) - 1}** {" ".join(no_users)}
+    #         description=f"""<:yes:{config.emoji.yes}> - **{len(yes_users) - 1}** {" ".join(yes_users)}
+    #         <:no:{config.emoji.no}> - **{len(no_users) - 1}** {" ".join(no_users)}
     #         **Both: ** **{len(both_users) - 1}** {" ".join(both_users)}
     #         **Did not vote: ** **{len(skipped_users)}** {" ".join(skipped_users)}
     #         """,
@@ -1,8 +1,9 @@
+import asyncio
 import logging
 import time
+import weakref
 
 import discord
-import privatebinapi
 from discord.commands import context
 from discord.ext import commands
 from discord.ui import InputText, Modal
@@ -13,6 +14,51 @@ from chiya.utils import embeds
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles", "categories", "channels.logs", "privatebin")
+
+# Locks are only kept alive while a submission for that user is in flight.
+_ticket_locks: weakref.WeakValueDictionary[int, asyncio.Lock] = weakref.WeakValueDictionary()
+
+
+def get_ticket_lock(user_id: int) -> asyncio.Lock:
+    """
+    Returns the lock guarding ticket creation for the given user.
+    """
+    lock = _ticket_locks.get(user_id)
+    if lock is None:
+        lock = _ticket_locks[user_id] = asyncio.Lock()
+    return lock
+
+
+def has_open_ticket(user_id: int) -> bool:
+    """
+    Checks the database for an open ticket. Blocking, run it off the event loop.
+    """
+    db = database.Database().get()
+    ticket = db["tickets"].find_one(user_id=user_id, status=False)
+    db.close()
+    return bool(ticket)
+
+
+def insert_ticket(user_id: int, guild_id: int, ticket_subject: str, ticket_message: str) -> None:
+    """
+    Inserts a new open ticket. Blocking, run it off the event loop.
+    """
+    db = database.Database().get()
+    db["tickets"].insert(
+        dict(
+            user_id=user_id,
+            guild=guild_id,
+            timestamp=int(time.time()),
+            ticket_subject=ticket_subject,
+            ticket_message=ticket_message,
+            log_url=None,
+            status=False,
+        )
+    )
+    db.commit()
+    db.close()
+
 
 class TicketInteractions(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
@@ -67,70 +113,86 @@ class TicketSubmissionModal(Modal):
         )
 
     async def callback(self, interaction: discord.Interaction):
-        category = discord.utils.get(interaction.guild.categories, id=config["categories"]["tickets"])
-        role_staff = discord.utils.get(interaction.guild.roles, id=config["roles"]["staff"])
-        permission = {
-            role_staff: discord.PermissionOverwrite(read_messages=True),
-            interaction.guild.default_role: discord.PermissionOverwrite(
-                read_messages=False,
-                manage_channels=False,
-                manage_permissions=False,
-                manage_messages=False,
-            ),
-            interaction.user: discord.PermissionOverwrite(read_messages=True),
-        }
-
-        channel = await interaction.guild.create_text_channel(
-            name=f"ticket-{interaction.user.id}",
-            category=category,
-            overwrites=permission,
-        )
-
-        if any(role.id == config["roles"]["vip"] for role in interaction.user.roles):
-            await channel.send(f"<@&{config['roles']['staff']}>")
-
-        ticket_subject = self.children[0].value
-        ticket_message = self.children[1].value
+        """
+        Create the ticket channel for the submitting user.
 
-        embed = embeds.make_embed(
-            title="🎫  Ticket created",
-            description="Please wait patiently until a staff member is available to assist you.",
-            fields=[
-                {"name": "Ticket Creator:", "value": interaction.user.mention, "inline": False},
-                {"name": "Ticket Subject:", "value": ticket_subject, "inline": False},
-                {"name": "Ticket Message:", "value": ticket_message, "inline": False},
-            ],
-            color=discord.Color.blurple(),
-        )
+        The interaction is deferred immediately so channel creation does not
+        run into the 3 second interaction timeout. A per-user lock makes
+        double-submits of the modal collapse into a single ticket.
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        async with get_ticket_lock(interaction.user.id):
+            category = discord.utils.get(interaction.guild.categories, id=config.categories.tickets)
+            ticket = discord.utils.get(category.text_channels, name=f"ticket-{interaction.user.id}")
+
+            # The channel cache is only updated once the gateway event arrives, so also check the database.
+            if ticket or await asyncio.to_thread(has_open_ticket, interaction.user.id):
+                embed = embeds.make_embed(
+                    color=discord.Color.red(),
+                    title="Error:",
+                    description=f"{interaction.user.mention}, you already have a ticket open.",
+                )
+                return await interaction.followup.send(embed=embed, ephemeral=True)
+
+            role_staff = discord.utils.get(interaction.guild.roles, id=config.roles.staff)
+            permission = {
+                role_staff: discord.PermissionOverwrite(read_messages=True),
+                interaction.guild.default_role: discord.PermissionOverwrite(
+                    read_messages=False,
+                    manage_channels=False,
+                    manage_permissions=False,
+                    manage_messages=False,
+                ),
+                interaction.user: discord.PermissionOverwrite(read_messages=True),
+            }
 
-        message = await channel.send(embed=embed, view=TicketCloseButton())
-        await message.pin()
+            channel = await interaction.guild.create_text_channel(
+                name=f"ticket-{interaction.user.id}",
+                category=category,
+                overwrites=permission,
+            )
 
-        ping = await channel.send(interaction.user.mention)
-        await ping.delete()
+            ticket_subject = self.children[0].value
+            ticket_message = self.children[1].value
 
-        embed = embeds.make_embed(
-            title="Created a ticket",
-            description=f"Successfully opened a ticket: {channel.mention}",
-            color=discord.Color.blurple(),
-        )
-        await interaction.response.send_message(embed=embed, view=None, ephemeral=True)
+            embed = embeds.make_embed(
+                title="🎫  Ticket created",
+                description="Please wait patiently until a staff member is available to assist you.",
+                fields=[
+                    {"name": "Ticket Creator:", "value": interaction.user.mention, "inline": False},
+                    {"name": "Ticket Subject:", "value": ticket_subject, "inline": False},
+                    {"name": "Ticket Message:", "value": ticket_message, "inline": False},
+                ],
+                color=discord.Color.blurple(),
+            )
+            message = await channel.send(embed=embed, view=TicketCloseButton())
 
-        db = database.Database().get()
-        db["tickets"].insert(
-            dict(
-                user_id=interaction.user.id,
-                guild=interaction.guild.id,
-                timestamp=int(time.time()),
-                ticket_subject=ticket_subject,
-                ticket_message=ticket_message,
-                log_url=None,
-                status=False,
+            success_embed = embeds.make_embed(
+                title="Created a ticket",
+                description=f"Successfully opened a ticket: {channel.mention}",
+                color=discord.Color.blurple(),
             )
-        )
 
-        db.commit()
-        db.close()
+            steps = [
+                message.pin(),
+                channel.send(interaction.user.mention, delete_after=1),
+                interaction.followup.send(embed=success_embed, ephemeral=True),
+                asyncio.to_thread(
+                    insert_ticket,
+                    user_id=interaction.user.id,
+                    guild_id=interaction.guild.id,
+                    ticket_subject=ticket_subject,
+                    ticket_message=ticket_message,
+                ),
+            ]
+            if interaction.user.get_role(config.roles.vip):
+                steps.append(channel.send(f"<@&{config.roles.staff}>"))
+
+            results = await asyncio.gather(*steps, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    log.error(f"Failed to finish setting up {channel.name}", exc_info=result)
 
 
 class TicketCreateButton(discord.ui.View):
@@ -145,7 +207,7 @@ class TicketCreateButton(discord.ui.View):
 
         The `button` parameter is positional and required despite unused.
         """
-        category = discord.utils.get(interaction.guild.categories, id=config["categories"]["tickets"])
+        category = discord.utils.get(interaction.guild.categories, id=config.categories.tickets)
         ticket = discord.utils.get(category.text_channels, name=f"ticket-{interaction.user.id}")
 
         if ticket:
@@ -185,8 +247,8 @@ class TicketCloseButton(discord.ui.View):
         ticket_subject = ticket["ticket_subject"]
         ticket_message = ticket["ticket_message"]
 
-        role_staff = discord.utils.get(interaction.guild.roles, id=config["roles"]["staff"])
-        role_trial_mod = discord.utils.get(interaction.guild.roles, id=config["roles"]["trial"])
+        role_staff = discord.utils.get(interaction.guild.roles, id=config.roles.staff)
+        role_trial_mod = discord.utils.get(interaction.guild.roles, id=config.roles.trial)
 
         member = discord.utils.get(interaction.guild.members, id=ticket_creator_id)
         if not member:
@@ -207,7 +269,10 @@ class TicketCloseButton(discord.ui.View):
                 mod_list.add(message.author)
 
         value = " ".join(mod.mention for mod in mod_list) if mod_list else mod_list.add("None")
-        url = privatebinapi.send(config["privatebin"]["url"], text=message_log, expiration="never")["full_url"]
+        # Deferred so loading the bot does not pay for it, tickets are closed rarely.
+        import privatebinapi
+
+        url = privatebinapi.send(config.privatebin.url, text=message_log, expiration="never")["full_url"]
         
         log_embed = embeds.make_embed(
             title=f"{interaction.channel.name} archived",
@@ -222,24 +287,19 @@ class TicketCloseButton(discord.ui.View):
                 {"name": "Ticket Log:", "value": url, "inline": False},
             ],
         )
-        ticket_log = discord.utils.get(interaction.guild.channels, id=config["channels"]["logs"]["ticket_log"])
+        ticket_log = discord.utils.get(interaction.guild.channels, id=config.channels.logs.ticket_log)
         await ticket_log.send(embed=log_embed)
 
         try:
-            dm_embed = embeds.make_embed(
+            dm_embed = await embeds.make_dm_embed(
+                guild=interaction.guild,
                 image_url="https://i.imgur.com/21nJqGC.gif",
-                color=discord.Color.blurple(),
                 title="Ticket closed",
                 description=(
                     "Your ticket was closed. "
                     "Please feel free to create a new ticket should you have any further inquiries."
                 ),
                 fields=[
-                    {
-                        "name": "Server:",
-                        "value": f"[{interaction.guild.name}]({await interaction.guild.vanity_invite()})",
-                        "inline": True,
-                    },
                     {"name": "Ticket Log:", "value": url, "inline": False},
                 ],
             )
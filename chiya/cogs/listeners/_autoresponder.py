@@ -9,6 +9,8 @@ from chiya.utils import embeds
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles",)
+
 
 class AutoresponderListeners(commands.Cog):
 
@@ -25,9 +27,7 @@ class AutoresponderListeners(commands.Cog):
         if message.author.bot:
             return
 
-        staff = [x for x in message.author.roles
-                 if x.id == config["roles"]["staff"]
-                 or x.id == config["roles"]["trial"]]
+        staff = [x for x in message.author.roles if x.id in config.roles.staff_roles]
         if not staff:
             return
 
@@ -1,11 +1,11 @@
 import logging
-import time
 from typing import Union
 
 import discord
 from discord.ext import commands
 
-from chiya import database
+from chiya.utils.auditlog import audit_log
+from chiya.utils.modlogs import log_mod_action
 
 
 log = logging.getLogger(__name__)
@@ -20,21 +20,9 @@ class BanListeners(commands.Cog):
         """
         Add the user's ban entry to the database if they were banned manually.
         """
-        ban_entry = await guild.fetch_ban(user)
-        logs = await guild.audit_logs(limit=1, action=discord.AuditLogAction.ban).flatten()
-        if logs[0].user != self.bot.user:
-            db = database.Database().get()
-            db["mod_logs"].insert(
-                dict(
-                    user_id=user.id,
-                    mod_id=logs[0].user.id,
-                    timestamp=int(time.time()),
-                    reason=ban_entry.reason,
-                    type="ban",
-                )
-            )
-            db.commit()
-            db.close()
+        entry = await audit_log.find(self.bot, guild, discord.AuditLogAction.ban, user.id)
+        if entry and entry.user.id != self.bot.user.id:
+            log_mod_action(user_id=user.id, mod_id=entry.user.id, reason=entry.reason, type="ban")
 
 
 def setup(bot: commands.Bot) -> None:
@@ -5,19 +5,23 @@ from discord.ext import commands
 
 from chiya import config
 from chiya.utils import embeds
+from chiya.utils.memberupdates import BOOST_STARTED, BOOST_STOPPED, MemberDiff, member_updates
 
 
 log = logging.getLogger(__name__)
 
+REQUIRED_CONFIG = ("roles", "channels.logs")
+
 
 class BoostListeners(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        member_updates.subscribe(bot, BOOST_STARTED, self.on_new_booster)
+        member_updates.subscribe(bot, BOOST_STOPPED, self.on_lost_booster)
 
-    @commands.Cog.listener()
-    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
-        await self.on_new_booster(before, after)
-        await self.on_lost_booster(before, after)
+    def cog_unload(self) -> None:
+        member_updates.unsubscribe(BOOST_STARTED, self.on_new_booster)
+        member_updates.unsubscribe(BOOST_STOPPED, self.on_lost_booster)
 
     @commands.Cog.listener()
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
@@ -35,46 +39,44 @@ class BoostListeners(commands.Cog):
                 description=(
                     "Thank you so much for the server boost! "
                     f"We are now at {after.premium_subscription_count} boosts! "
-                    f"You can contact any <@&{config['roles']['staff']}> member with a "
+                    f"You can contact any <@&{config.roles.staff}> member with a "
                     "[hex color](https://www.google.com/search?q=hex+color) "
                     "and your desired role name for a custom booster role."
                 ),
             )
             await before.system_channel.send(embed=embed)
 
-    async def on_new_booster(self, before: discord.Member, after: discord.Member) -> None:
+    async def on_new_booster(self, before: discord.Member, after: discord.Member, diff: MemberDiff) -> None:
         """
         Send an embed in #nitro-logs when a new boost was received.
         """
-        if not before.premium_since and after.premium_since:
-            channel = discord.utils.get(after.guild.channels, id=config["channels"]["logs"]["nitro_log"])
-            embed = embeds.make_embed(
-                color=discord.Color.nitro_pink(),
-                title="New booster",
-                description=(
-                    f"{after.mention} boosted the server. "
-                    f"We're now at {after.guild.premium_subscription_count} boosts."
-                ),
-            )
-            await channel.send(embed=embed)
-            log.info(f"{after} boosted {after.guild.name}.")
+        channel = self.bot.get_channel(config.channels.logs.nitro_log)
+        embed = embeds.make_embed(
+            color=discord.Color.nitro_pink(),
+            title="New booster",
+            description=(
+                f"{after.mention} boosted the server. "
+                f"We're now at {after.guild.premium_subscription_count} boosts."
+            ),
+        )
+        await channel.send(embed=embed)
+        log.info(f"{after} boosted {after.guild.name}.")
 
-    async def on_lost_booster(self, before: discord.Member, after: discord.Member) -> None:
+    async def on_lost_booster(self, before: discord.Member, after: discord.Member, diff: MemberDiff) -> None:
         """
         Send an embed in #nitro-logs when a boost was lost.
         """
-        if before.premium_since and not after.premium_since:
-            channel = discord.utils.get(after.guild.channels, id=config["channels"]["logs"]["nitro_log"])
-            embed = embeds.make_embed(
-                color=discord.Color.nitro_pink(),
-                title="Lost booster",
-                description=(
-                    f"{after.mention} no longer boosts the server. "
-                    f"We're now at {after.guild.premium_subscription_count} boosts."
-                ),
-            )
-            await channel.send(embed=embed)
-            log.info(f"{after} stopped boosting {after.guild.name}.")
+        channel = self.bot.get_channel(config.channels.logs.nitro_log)
+        embed = embeds.make_embed(
+            color=discord.Color.nitro_pink(),
+            title="Lost booster",
+            description=(
+                f"{after.mention} no longer boosts the server. "
+                f"We're now at {after.guild.premium_subscription_count} boosts."
+            ),
+        )
+        await channel.send(embed=embed)
+        log.info(f"{after} stopped boosting {after.guild.name}.")
 
 
 def setup(bot: commands.Bot) -> None:
@@ -1,41 +1,39 @@
 import logging
-import time
 
 import discord
-from chiya import database
 from discord.ext import commands
 
+from chiya.utils.auditlog import audit_log
+from chiya.utils.memberupdates import TIMED_OUT, MemberDiff, member_updates
+from chiya.utils.modlogs import log_mod_action
+
+
 log = logging.getLogger(__name__)
 
 
 class MuteListeners(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        member_updates.subscribe(bot, TIMED_OUT, self.on_timed_out)
+
+    def cog_unload(self) -> None:
+        member_updates.unsubscribe(TIMED_OUT, self.on_timed_out)
 
-    @commands.Cog.listener()
-    async def on_member_update(
-        self, before: discord.Member, after: discord.Member
-    ) -> None:
+    async def on_timed_out(self, before: discord.Member, after: discord.Member, diff: MemberDiff) -> None:
         """
         Add the user's mute entry to the database if they were timed out manually.
         """
-        if not before.timed_out and after.timed_out:
-            logs = await after.guild.audit_logs(
-                limit=1, action=discord.AuditLogAction.member_update
-            ).flatten()
-            if logs[0].user != self.bot.user:
-                db = database.Database().get()
-                db["mod_logs"].insert(
-                    dict(
-                        user_id=after.id,
-                        mod_id=logs[0].user.id,
-                        timestamp=int(time.time()),
-                        reason=logs[0].reason,
-                        type="mute",
-                    )
-                )
-                db.commit()
-                db.close()
+        entry = await audit_log.find(
+            self.bot, after.guild, discord.AuditLogAction.member_update, after.id, change="communication_disabled_until"
+        )
+        if entry and entry.user.id != self.bot.user.id:
+            log_mod_action(
+                mute_until=int(after.communication_disabled_until.timestamp()),
+                user_id=after.id,
+                mod_id=entry.user.id,
+                reason=entry.reason,
+                type="mute",
+            )
 
 
 def setup(bot: commands.Bot) -> None:
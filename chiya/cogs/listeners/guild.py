@@ -0,0 +1,26 @@
+import logging
+
+import discord
+from discord.ext import commands
+
+from chiya.utils.guildcache import guild_metadata
+
+
+log = logging.getLogger(__name__)
+
+
+class GuildListeners(commands.Cog):
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        """
+        Drop the cached guild metadata so DMs pick up the new name, icon or vanity invite.
+        """
+        guild_metadata.invalidate(after)
+
+
+def setup(bot: commands.Bot) -> None:
+    bot.add_cog(GuildListeners(bot))
+    log.info("Listeners loaded: guild")
@@ -73,16 +73,16 @@ class Starboard(commands.Cog):
             # message.author.bot
             message.author.id == payload.member.id
             # or channel.is_nsfw()
-            or payload.channel_id in config["channels"]["starboard"]["blacklisted"]
-            or star_count < config["channels"]["starboard"]["star_limit"]
+            or payload.channel_id in config.channels.starboard.blacklisted
+            or star_count < config.channels.starboard.star_limit
             or (payload.message_id, payload.channel_id) in self.cache
         ):
             return
 
         self.cache.append((payload.channel_id, payload.message_id))
 
-        starboard_channel = await self.bot.fetch_channel(config["channels"]["starboard"]["channel_id"])
-        #starboard_channel = discord.utils.get(message.guild.channels, id=config["channels"]["starboard"]["channel_id"])
+        starboard_channel = await self.bot.fetch_channel(config.channels.starboard.channel_id)
+        #starboard_channel = discord.utils.get(message.guild.channels, id=config.channels.starboard.channel_id)
 
         db = database.Database().get()
         result = db["starboard"].find_one(channel_id=payload.channel_id, message_id=payload.message_id)
@@ -159,8 +159,8 @@ class Starboard(commands.Cog):
             db.close()
             return
 
-        # starboard_channel = discord.utils.get(message.guild.channels, id=config["channels"]["starboard"]["channel_id"])
-        starboard_channel = await self.bot.fetch_channel(config["channels"]["starboard"]["channel_id"])
+        # starboard_channel = discord.utils.get(message.guild.channels, id=config.channels.starboard.channel_id)
+        starboard_channel = await self.bot.fetch_channel(config.channels.starboard.channel_id)
         
         try:
             star_embed = await starboard_channel.fetch_message(result["star_embed_id"])
@@ -170,7 +170,7 @@ class Starboard(commands.Cog):
 
         star_count = await self.get_star_count(message, stars)
 
-        if star_count < config["channels"]["starboard"]["star_limit"]:
+        if star_count < config.channels.starboard.star_limit:
             db["starboard"].delete(channel_id=payload.channel_id, message_id=payload.message_id)
             db.commit()
             db.close()
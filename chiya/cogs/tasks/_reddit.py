@@ -1,11 +1,12 @@
+import asyncio
 import logging
 import time
 
-import asyncpraw
 import discord
 from discord.ext import commands, tasks
 
 from chiya import config
+from config import Config, Reddit
 
 
 log = logging.getLogger(__name__)
@@ -16,16 +17,29 @@ class RedditTasks(commands.Cog):
         self.bot = bot
         self.bot_started_at = time.time()
         self.cache = []
-        self.client_id = config.get("reddit", {}).get("client_id")
-        self.client_secret = config.get("reddit", {}).get("client_secret")
-        self.user_agent = config.get("reddit", {}).get("user_agent")
-        self.subreddit = config.get("reddit", {}).get("subreddit")
-        self.channel = config.get("reddit", {}).get("channel")
+        self.reddit = None
+        self.configure()
+        config.subscribe("reddit", self.on_reddit_config_changed)
+
+    def configure(self) -> None:
+        """
+        Reads the reddit settings and starts the background task if all of
+        them are set.
+        """
+        reddit = config.reddit or Reddit()
+        self.client_id = reddit.client_id
+        self.client_secret = reddit.client_secret
+        self.user_agent = reddit.user_agent
+        self.subreddit = reddit.subreddit
+        self.channel = reddit.channel
 
         if not all([self.client_id, self.client_secret, self.user_agent, self.subreddit, self.channel]):
             log.warning("Reddit functionality is disabled due to missing prerequisites")
             return
 
+        # Only imported once reddit is configured, it is one of the slowest imports of the bot.
+        import asyncpraw
+
         self.reddit = asyncpraw.Reddit(
             client_id=self.client_id, client_secret=self.client_secret, user_agent=self.user_agent
         )
@@ -34,8 +48,25 @@ class RedditTasks(commands.Cog):
         self.check_for_posts.start()
 
     def cog_unload(self) -> None:
+        config.unsubscribe("reddit", self.on_reddit_config_changed)
         self.check_for_posts.cancel()
 
+    async def on_reddit_config_changed(self, old: Config, new: Config, changed: list) -> None:
+        """
+        Restarts the background task with the reloaded settings.
+        """
+        if self.check_for_posts.is_running():
+            task = self.check_for_posts.get_task()
+            self.check_for_posts.cancel()
+            # The loop can't be started again until the cancelled task has finished.
+            await asyncio.gather(task, return_exceptions=True)
+
+        if self.reddit:
+            await self.reddit.close()
+            self.reddit = None
+
+        self.configure()
+
     @tasks.loop(seconds=5)
     async def check_for_posts(self) -> None:
         """
@@ -45,7 +76,7 @@ class RedditTasks(commands.Cog):
         await self.bot.wait_until_ready()
 
         try:
-            subreddit = await self.reddit.subreddit(config["reddit"]["subreddit"])
+            subreddit = await self.reddit.subreddit(self.subreddit)
             async for submission in subreddit.new(limit=10):
                 if submission.id in self.cache or submission.created_utc <= self.bot_started_at:
                     continue
@@ -6,6 +6,7 @@ from discord.ext import commands, tasks
 
 from chiya import database
 from chiya.utils import embeds
+from chiya.utils.recurrence import catch_up
 
 
 log = logging.getLogger(__name__)
@@ -25,6 +26,7 @@ class ReminderTasks(commands.Cog):
         Checking for reminders to send
         """
         await self.bot.wait_until_ready()
+        await database.wait_until_ready()
 
         db = database.Database().get()
         result = db["remind_me"].find(sent=False, date_to_remind={"<": datetime.now(tz=timezone.utc).timestamp()})
@@ -51,7 +53,12 @@ class ReminderTasks(commands.Cog):
                     if not await dm.send(embed=embed):
                         log.warning(f"Unable to post or DM {user}'s reminder {reminder['id']=}.")
 
-            db["remind_me"].update(dict(id=reminder["id"], sent=True), ["id"])
+            # Repeating reminders are rescheduled in place instead of being marked as sent.
+            if reminder["recurrence"]:
+                next_due = catch_up(reminder["recurrence"], reminder["date_to_remind"])
+                db["remind_me"].update(dict(id=reminder["id"], date_to_remind=next_due), ["id"])
+            else:
+                db["remind_me"].update(dict(id=reminder["id"], sent=True), ["id"])
 
         db.commit()
         db.close()
@@ -1,15 +1,387 @@
+import asyncio
+import collections.abc
+import dataclasses
 import logging
 import os
+import types
+import typing
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Optional
 
 from pyaml_env import parse_config
 
 
 log = logging.getLogger(__name__)
 
+# Sections read once when the bot starts or a cog is imported, e.g. in command decorators. A reload still updates
+# them for code that reads them at runtime, but they only fully take effect after a restart.
+RESTART_SECTIONS = frozenset({"guild_ids", "bot", "database", "roles", "cogs"})
+
+# Keys from earlier versions of config.default.yml that nothing reads anymore.
+RETIRED_KEYS = frozenset(
+    {"roles.trial_mod", "roles.muted", "roles.restricted", "channels.mod", "channels.logs.mute_log", "timeout_limit"}
+)
+
+
+class ConfigError(Exception):
+    """Raised when config.yml does not match the configuration model."""
+
+
+@dataclass(frozen=True)
+class Intents:
+    messages: bool
+    message_content: bool
+    guilds: bool
+    members: bool
+    bans: bool
+    reactions: bool
+
+
+@dataclass(frozen=True)
+class Bot:
+    token: str
+    prefix: str
+    status: str
+    intents: Intents
+    log_level: Optional[str] = None
+    log_format: str = "text"
+    log_queue_size: int = 10000
+    webhook_url: Optional[str] = None
+    case_insensitive: bool = True
+    sync_commands: bool = True
+    sync_on_cog_reload: bool = True
+
+    def __post_init__(self) -> None:
+        if self.log_format not in ("text", "json"):
+            raise ConfigError(f"bot.log_format: must be text or json, not {self.log_format!r}")
+
+
+@dataclass(frozen=True)
+class Roles:
+    staff: int
+    trial: int
+    chat_mod: int
+    vip: int
+    nitro_booster: int
+    # Roles allowed to use the staff tools that trial moderators also have access to.
+    staff_roles: frozenset = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "staff_roles", frozenset({self.staff, self.trial}))
+
+
+@dataclass(frozen=True)
+class Categories:
+    tickets: int
+    moderation: int
+    logs: int
+    development: int
+    # Categories that can't be purged or have messages moved out of them for security reasons.
+    protected: frozenset = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "protected", frozenset({self.moderation, self.development, self.logs, self.tickets}))
+
+
+@dataclass(frozen=True)
+class PublicChannels:
+    questions_and_help: int
+
+
+@dataclass(frozen=True)
+class LogChannels:
+    ticket_log: int
+    nitro_log: int
+
+
+@dataclass(frozen=True)
+class Starboard:
+    star_limit: int
+    channel_id: int
+    blacklisted: frozenset[int] = frozenset()
+
+
+@dataclass(frozen=True)
+class Channels:
+    starboard: Starboard
+    public: Optional[PublicChannels] = None
+    logs: Optional[LogChannels] = None
+
+
+@dataclass(frozen=True)
+class Emoji:
+    yes: int
+    no: int
+
+
+@dataclass(frozen=True)
+class Reddit:
+    """Every field is optional, the reddit task disables itself unless all of them are set."""
+
+    subreddit: Optional[str] = None
+    channel: Optional[int] = None
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    user_agent: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Privatebin:
+    url: str
+
+
+@dataclass(frozen=True)
+class Database:
+    database: str
+    host: str
+    user: str
+    password: str
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    The parsed and validated contents of config.yml. Sections that are
+    commented out in config.default.yml are optional and None when missing,
+    cogs that read them list them in their REQUIRED_CONFIG.
+    """
+
+    guild_ids: tuple[int, ...]
+    bot: Bot
+    channels: Channels
+    database: Database
+    emoji_guild_ids: tuple[int, ...] = ()
+    roles: Optional[Roles] = None
+    categories: Optional[Categories] = None
+    emoji: Optional[Emoji] = None
+    reddit: Optional[Reddit] = None
+    privatebin: Optional[Privatebin] = None
+    cogs: Mapping[str, bool] = field(default_factory=lambda: types.MappingProxyType({}))
+
+
+def _convert(value: typing.Any, annotation: typing.Any, path: str, errors: list) -> typing.Any:
+    """
+    Converts a parsed YAML value to the annotated type, recording any
+    mismatch in `errors` so every problem is reported at once.
+    """
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Union:
+        if value is None:
+            return None
+        return _convert(value, next(arg for arg in args if arg is not type(None)), path, errors)
+
+    if dataclasses.is_dataclass(annotation):
+        return _build(annotation, value, path, errors)
+
+    if origin in (tuple, frozenset):
+        if not isinstance(value, list):
+            errors.append(f"{path}: expected a list, got {type(value).__name__}")
+            return origin()
+        return origin(_convert(item, args[0], f"{path}[{i}]", errors) for i, item in enumerate(value))
+
+    if origin in (dict, collections.abc.Mapping):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected a mapping, got {type(value).__name__}")
+            return types.MappingProxyType({})
+        items = {str(key): _convert(item, args[1], f"{path}.{key}", errors) for key, item in value.items()}
+        return types.MappingProxyType(items)
+
+    if annotation is int:
+        # Values substituted from environment variables are always strings.
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+        if isinstance(value, bool) or not isinstance(value, int):
+            errors.append(f"{path}: expected an integer, got {value!r}")
+        return value
+
+    if annotation is str:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if not isinstance(value, str):
+            errors.append(f"{path}: expected a string, got {value!r}")
+        return value
+
+    if annotation is bool and not isinstance(value, bool):
+        errors.append(f"{path}: expected true or false, got {value!r}")
+    return value
+
+
+def _build(cls: type, data: typing.Any, path: str, errors: list) -> typing.Any:
+    if not isinstance(data, dict):
+        errors.append(f"{path or 'config.yml'}: expected a mapping, got {type(data).__name__}")
+        return None
+
+    failed = len(errors)
+    values = {}
+    for f in dataclasses.fields(cls):
+        if not f.init:
+            continue
+        key = f"{path}.{f.name}" if path else f.name
+        if f.name in data:
+            values[f.name] = _convert(data[f.name], f.type, key, errors)
+        elif f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+            errors.append(f"{key}: missing")
+
+    # Unknown keys are either retired or misspelled, and the latter would otherwise silently fall back to their default.
+    known = {f.name for f in dataclasses.fields(cls) if f.init}
+    for name in sorted(data.keys() - known):
+        key = f"{path}.{name}" if path else name
+        if key in RETIRED_KEYS:
+            log.warning(f"config.yml: {key} is no longer used and can be removed")
+        else:
+            log.warning(f"config.yml: ignoring unknown key {key}")
+
+    if len(errors) > failed:
+        return None
+    try:
+        return cls(**values)
+    except (ConfigError, TypeError) as e:
+        errors.append(str(e))
+        return None
+
+
+def load_config(path: str) -> Config:
+    """
+    Parses config.yml into a Config, raising ConfigError that lists every
+    missing or mistyped key.
+    """
+    data = parse_config(path)
+    errors = []
+    config = _build(Config, data, "", errors)
+    if errors:
+        raise ConfigError("\n".join(errors))
+    return config
+
+
+def missing_sections(config: Config, sections: typing.Iterable) -> list:
+    """
+    Returns the optional sections, e.g. "channels.logs", that are not set
+    in the config.
+    """
+    missing = []
+    for section in sections:
+        value = config
+        for name in section.split("."):
+            value = getattr(value, name, None)
+        if not value:
+            missing.append(section)
+    return missing
+
+
+def diff_config(old: typing.Any, new: typing.Any, prefix: str = "") -> list:
+    """
+    Returns the dotted paths of the values that differ between two configs,
+    e.g. "channels.starboard.star_limit".
+    """
+    changed = []
+    for f in dataclasses.fields(new):
+        before, after = getattr(old, f.name), getattr(new, f.name)
+        if before == after:
+            continue
+        if dataclasses.is_dataclass(before) and dataclasses.is_dataclass(after):
+            changed += diff_config(before, after, f"{prefix}{f.name}.")
+        else:
+            changed.append(f"{prefix}{f.name}")
+    return changed
+
+
+def _affects(path: str, section: str) -> bool:
+    """
+    Whether a changed path concerns a section, either a value below it or
+    one above it such as the whole section being added or removed.
+    """
+    return path == section or path.startswith(f"{section}.") or section.startswith(f"{path}.")
+
+
+class ConfigStore:
+    """
+    Holds the current Config. Attribute access reads through to it, so code
+    reading `config.channels.starboard.star_limit` at runtime sees the
+    latest reload without holding on to the store itself.
+
+    Cogs that derive state from a section subscribe to it and are notified
+    with the old config, the new config and the changed paths after a
+    reload.
+    """
+
+    def __init__(self, path: str, current: Config) -> None:
+        self.path = path
+        self.current = current
+        self._subscribers = defaultdict(list)
+        self._requirements = {}
+        self._lock = asyncio.Lock()
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.current, name)
+
+    def subscribe(self, section: str, handler: Callable) -> None:
+        """
+        Calls the handler whenever a reload changes the section, e.g.
+        "reddit" or "channels.starboard".
+        """
+        self._subscribers[section].append(handler)
+
+    def unsubscribe(self, section: str, handler: Callable) -> None:
+        """
+        Stops calling the handler, e.g. when its cog is unloaded.
+        """
+        if handler in self._subscribers[section]:
+            self._subscribers[section].remove(handler)
+
+    def require(self, name: str, sections: tuple) -> list:
+        """
+        Returns the optional sections a cog needs that the current config is
+        missing. If there are none, reloads are refused from then on if they
+        would remove one of them.
+        """
+        missing = missing_sections(self.current, sections)
+        if not missing:
+            self._requirements[name] = tuple(sections)
+        return missing
+
+    async def reload(self) -> list:
+        """
+        Parses config.yml again and swaps it in, returning the changed
+        paths. Raises ConfigError and keeps the current config if the file
+        is invalid or lacks a section a loaded cog needs.
+        """
+        async with self._lock:
+            new = await asyncio.to_thread(load_config, self.path)
+            errors = [
+                f"{section}: required by {name}"
+                for name, sections in self._requirements.items()
+                for section in missing_sections(new, sections)
+            ]
+            if errors:
+                raise ConfigError("\n".join(errors))
+
+            old, self.current = self.current, new
+            changed = diff_config(old, new)
+            log.info(f"Reloaded config.yml, changed: {', '.join(changed) or 'nothing'}")
+
+            affected = [section for section in self._subscribers if any(_affects(path, section) for path in changed)]
+            # A handler subscribed to several changed sections is only called once.
+            handlers = list(dict.fromkeys(handler for section in affected for handler in self._subscribers[section]))
+            results = await asyncio.gather(
+                *(handler(old, new, changed) for handler in handlers), return_exceptions=True
+            )
+            for handler, result in zip(handlers, results):
+                if isinstance(result, Exception):
+                    log.error(f"Config subscriber {handler.__qualname__} failed", exc_info=result)
+
+            return changed
+
 
 path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yml")
 if not os.path.isfile(path):
     log.error("Unable to load config.yml, exiting...")
     raise SystemExit
 
-config = parse_config(path)
+try:
+    config = ConfigStore(path, load_config(path))
+except ConfigError as e:
+    log.error(f"config.yml is invalid, exiting...\n{e}")
+    raise SystemExit
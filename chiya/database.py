@@ -1,4 +1,9 @@
+import asyncio
+import atexit
 import logging
+import threading
+import time
+import typing
 
 import dataset
 from sqlalchemy import create_engine
@@ -12,17 +17,16 @@ log = logging.getLogger(__name__)
 
 class Database:
     def __init__(self) -> None:
-        self.host = config["database"]["host"]
-        self.database = config["database"]["database"]
-        self.user = config["database"]["user"]
-        self.password = config["database"]["password"]
+        self.host = config.database.host
+        self.database = config.database.database
+        self.user = config.database.user
+        self.password = config.database.password
 
         if not all([self.host, self.database, self.user, self.password]):
             log.error("One or more database connection variables are missing, exiting...")
             raise SystemExit
 
         self.url = f"mysql://{self.user}:{self.password}@{self.host}/{self.database}"
-        self.setup()
 
     def get(self) -> dataset.Database:
         """
@@ -32,7 +36,7 @@ class Database:
 
     def setup(self) -> None:
         """
-        Sets up the tables needed for Chiya.
+        Sets up the tables needed for Chiya. Run once at startup by prepare().
         """
         engine = create_engine(self.url)
         if not database_exists(engine.url):
@@ -81,6 +85,45 @@ class Database:
         #     tickets.create_column("status", db.types.boolean)
         #     log.info("Created missing table: tickets")
 
+        # Backs the /searchlogs full-text search over mod log reasons and notes.
+        if "mod_logs" in db and not list(db.query("SHOW INDEX FROM mod_logs WHERE Key_name = 'ft_mod_logs_reason'")):
+            db.executable.execute("ALTER TABLE mod_logs ADD FULLTEXT INDEX ft_mod_logs_reason (reason)")
+            log.info("Created missing index: ft_mod_logs_reason")
+
+        if "mod_summaries" not in db:
+            mod_summaries = db.create_table("mod_summaries")
+            mod_summaries.create_column("user_id", db.types.bigint, unique=True)
+            for action_type in ("ban", "unban", "mute", "unmute", "warn", "note"):
+                mod_summaries.create_column(f"{action_type}s", db.types.integer, default=0)
+            mod_summaries.create_column("last_action_type", db.types.text)
+            mod_summaries.create_column("last_action_timestamp", db.types.bigint)
+            mod_summaries.create_column("mute_until", db.types.bigint)
+            log.info("Created missing table: mod_summaries")
+
+        if "mod_log_revisions" not in db:
+            mod_log_revisions = db.create_table("mod_log_revisions")
+            mod_log_revisions.create_column("log_id", db.types.bigint)
+            mod_log_revisions.create_column("editor_id", db.types.bigint)
+            mod_log_revisions.create_column("timestamp", db.types.bigint)
+            mod_log_revisions.create_column("old_reason", db.types.text)
+            mod_log_revisions.create_column("new_reason", db.types.text)
+            mod_log_revisions.create_index(["log_id"])
+            log.info("Created missing table: mod_log_revisions")
+
+        if "remind_me" in db:
+            remind_me = db["remind_me"]
+            if not remind_me.has_column("recurrence"):
+                remind_me.create_column("recurrence", db.types.string(32))
+                log.info("Created missing column: remind_me.recurrence")
+            # Keeps the reminder task's due query a single range scan.
+            remind_me.create_index(["sent", "date_to_remind"])
+
+        if "user_settings" not in db:
+            user_settings = db.create_table("user_settings")
+            user_settings.create_column("user_id", db.types.bigint, unique=True)
+            user_settings.create_column("timezone", db.types.string(64))
+            log.info("Created missing table: user_settings")
+
         if "starboard" not in db:
             starboard = db.create_table("starboard")
             starboard.create_column("channel_id", db.types.bigint)
@@ -89,3 +132,168 @@ class Database:
 
         db.commit()
         db.close()
+
+
+# Set once the schema checks have run, cogs that touch the database on their own schedule await it.
+ready = asyncio.Event()
+
+
+async def prepare() -> None:
+    """
+    Runs the schema checks once in a worker thread, so they overlap with the
+    gateway login instead of delaying it, and marks the database ready.
+    """
+    await asyncio.to_thread(Database().setup)
+    ready.set()
+    log.info("Database is ready")
+
+
+async def wait_until_ready() -> None:
+    """
+    Waits until the schema checks run at startup have finished.
+    """
+    await ready.wait()
+
+
+class ModLogWriter:
+    """
+    Write-behind queue for mod_logs rows.
+
+    Actions are queued in memory and inserted in batches with a single
+    multi-row INSERT once `batch_size` rows are pending or `flush_interval`
+    seconds have passed, in a worker thread so commands never wait on the
+    database. `on_insert(db, rows)` is called with the batch on the same
+    connection before the commit, so derived tables stay consistent. It may
+    return a callable that is run only once the commit succeeded, e.g. to
+    update in-memory caches that must not see a rolled back batch.
+
+    Rows whose ID is needed are flushed immediately and inserted one by one
+    so their future resolves to the new ID. Anything still queued when the
+    interpreter exits is written synchronously.
+    """
+
+    def __init__(
+        self,
+        on_insert: typing.Callable = None,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.on_insert = on_insert
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush_sync)
+
+    def submit(self, row: dict, mute_until: int = None, need_id: bool = False) -> asyncio.Future:
+        """
+        Queues a mod_logs row and returns a future resolving to its ID, or
+        None if `need_id` was not set.
+        """
+        loop = asyncio.get_running_loop()
+        row.setdefault("timestamp", int(time.time()))
+        future = loop.create_future()
+        self._pending.append(dict(row=row, mute_until=mute_until, need_id=need_id, future=future, attempts=0))
+
+        if need_id or len(self._pending) >= self.batch_size:
+            self._schedule(0)
+        elif not self._timer:
+            self._schedule(self.flush_interval)
+
+        return future
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """
+        Writes every queued row. Failed batches are requeued until they run
+        out of attempts.
+        """
+        await wait_until_ready()
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception:
+            log.exception(f"Failed to write {len(batch)} mod_logs rows")
+            retry = []
+            for entry in batch:
+                entry["attempts"] += 1
+                if entry["attempts"] < self.max_attempts:
+                    retry.append(entry)
+                    continue
+                log.error(f"Dropping mod_logs row after {entry['attempts']} attempts: {entry['row']}")
+                if entry["need_id"]:
+                    entry["future"].set_exception(RuntimeError("Failed to write the mod_logs row"))
+                else:
+                    entry["future"].set_result(None)
+
+            if retry:
+                self._pending = retry + self._pending
+                self._schedule(self.flush_interval)
+            return
+
+        for entry in batch:
+            if not entry["future"].done():
+                entry["future"].set_result(entry["row"].get("id"))
+
+    def flush_sync(self) -> None:
+        """
+        Writes every queued row from the calling thread, for use at shutdown
+        when the event loop is no longer running.
+        """
+        batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+            log.info(f"Flushed {len(batch)} queued mod_logs rows at shutdown")
+
+    def _write(self, batch: list) -> None:
+        with self._write_lock:
+            db = Database().get()
+            try:
+                db.begin()
+                table = db["mod_logs"]
+                bulk = []
+                for entry in batch:
+                    if entry["need_id"]:
+                        entry["row"]["id"] = table.insert(entry["row"])
+                    else:
+                        bulk.append(entry["row"])
+
+                if bulk:
+                    # Rows carry different optional columns (e.g. duration), so pad them to one shape.
+                    columns = set().union(*bulk)
+                    table.insert_many([{column: row.get(column) for column in columns} for row in bulk])
+
+                on_commit = None
+                if self.on_insert:
+                    on_commit = self.on_insert(db, [(entry["row"], entry["mute_until"]) for entry in batch])
+
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            # The batch is committed by now, so a failing callback must not send it back to be written again.
+            if on_commit:
+                try:
+                    on_commit()
+                except Exception:
+                    log.exception("mod_logs commit callback failed")
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional
+
+import discord
+from discord.ext import commands
+from discord.state import ConnectionState
+
+
+log = logging.getLogger(__name__)
+
+
+class Waiter:
+    """A gateway event waiting for its audit log entry."""
+
+    __slots__ = ("action", "target_id", "change", "seen_at", "future")
+
+    def __init__(
+        self,
+        action: discord.AuditLogAction,
+        target_id: int,
+        change: Optional[str],
+        seen_at: datetime,
+        future: asyncio.Future,
+    ) -> None:
+        self.action = action
+        self.target_id = target_id
+        self.change = change
+        self.seen_at = seen_at
+        self.future = future
+
+    def matches(self, entry: discord.AuditLogEntry, window: timedelta) -> bool:
+        target_id = getattr(entry.target, "id", None)
+        return (
+            entry.action == self.action
+            and target_id == self.target_id
+            and (not self.change or hasattr(entry.changes.after, self.change))
+            and self.seen_at - window <= entry.created_at <= self.seen_at + window
+        )
+
+
+class AuditLogCorrelator:
+    """
+    Matches gateway events such as bans and timeouts to the audit log entry
+    describing who performed them.
+
+    Instead of every event handler reading the newest audit log entry, which
+    attributes the wrong moderator when several actions land at once, events
+    register a waiter by action and target. Entries are fetched in batches
+    with `after=` the last seen entry, shared by every waiter of the guild,
+    and each entry is handed to at most one waiter. Recent entries are kept
+    around briefly since the entry may be fetched before its event arrives.
+
+    When the installed py-cord dispatches audit log entries over the gateway
+    they are fed in directly and no polling happens at all.
+    """
+
+    def __init__(self, poll_delay: float = 1.0, timeout: float = 15.0, window: int = 30, buffer: int = 200) -> None:
+        self.poll_delay = poll_delay
+        self.timeout = timeout
+        self.window = timedelta(seconds=window)
+        self.buffer = buffer
+        self.bot = None
+        self.gateway = False
+        self._waiters = {}
+        self._recent = {}
+        self._last_seen = {}
+        self._pollers = {}
+
+    def _attach(self, bot: commands.Bot) -> None:
+        if self.bot:
+            return
+
+        self.bot = bot
+        # Older py-cord releases have no parser for GUILD_AUDIT_LOG_ENTRY_CREATE, so fall back to polling.
+        if hasattr(ConnectionState, "parse_guild_audit_log_entry_create"):
+            self.gateway = True
+            bot.add_listener(self._on_audit_log_entry, "on_audit_log_entry")
+
+    async def find(
+        self,
+        bot: commands.Bot,
+        guild: discord.Guild,
+        action: discord.AuditLogAction,
+        target_id: int,
+        change: str = None,
+    ) -> Optional[discord.AuditLogEntry]:
+        """
+        Returns the audit log entry of an action just seen on the gateway,
+        or None if it did not show up in time. Actions such as member_update
+        cover several kinds of edits, `change` narrows them down to entries
+        that changed that attribute, e.g. "communication_disabled_until".
+        """
+        self._attach(bot)
+        future = asyncio.get_running_loop().create_future()
+        waiter = Waiter(action, target_id, change, discord.utils.utcnow(), future)
+
+        recent = self._recent.setdefault(guild.id, deque(maxlen=self.buffer))
+        for entry in recent:
+            if waiter.matches(entry, self.window):
+                recent.remove(entry)
+                return entry
+
+        waiters = self._waiters.setdefault(guild.id, [])
+        waiters.append(waiter)
+        if not self.gateway and guild.id not in self._pollers:
+            self._pollers[guild.id] = asyncio.create_task(self._poll(guild))
+
+        try:
+            return await asyncio.wait_for(waiter.future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"No audit log entry found for {action} on {target_id}")
+            return None
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+
+    def _feed(self, guild_id: int, entry: discord.AuditLogEntry) -> None:
+        """
+        Hands the entry to the first waiter it matches or keeps it for
+        events that have not arrived yet.
+        """
+        self._last_seen[guild_id] = max(entry.id, self._last_seen.get(guild_id, 0))
+
+        waiters = self._waiters.get(guild_id, [])
+        for waiter in waiters:
+            if not waiter.future.done() and waiter.matches(entry, self.window):
+                waiters.remove(waiter)
+                waiter.future.set_result(entry)
+                return
+
+        self._recent.setdefault(guild_id, deque(maxlen=self.buffer)).append(entry)
+
+    async def _on_audit_log_entry(self, entry: discord.AuditLogEntry) -> None:
+        self._feed(entry.guild.id, entry)
+
+    async def _poll(self, guild: discord.Guild) -> None:
+        """
+        Fetches new entries while the guild has waiters, batching a burst of
+        events into one request.
+        """
+        try:
+            while self._waiters.get(guild.id):
+                await asyncio.sleep(self.poll_delay)
+
+                if guild.id in self._last_seen:
+                    entries = [guild.audit_logs(limit=None, after=discord.Object(id=self._last_seen[guild.id]))]
+                else:
+                    # Without a starting point only the newest entries of the actions waited for are read.
+                    actions = dict.fromkeys(waiter.action for waiter in self._waiters[guild.id])
+                    entries = [guild.audit_logs(limit=100, action=action) for action in actions]
+
+                for iterator in entries:
+                    async for entry in iterator:
+                        self._feed(guild.id, entry)
+        except discord.HTTPException as e:
+            log.warning(f"Unable to read the audit log of {guild.name}: {e}")
+            for waiter in self._waiters.pop(guild.id, []):
+                if not waiter.future.done():
+                    waiter.future.set_result(None)
+        finally:
+            self._pollers.pop(guild.id, None)
+
+
+audit_log = AuditLogCorrelator()
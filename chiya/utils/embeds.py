@@ -3,6 +3,8 @@ import datetime
 import discord
 from discord.commands import context
 
+from chiya.utils.guildcache import guild_metadata
+
 
 def make_embed(
     ctx: context.ApplicationContext = None,
@@ -98,3 +100,26 @@ def error_embed(ctx: context.ApplicationContext, title: str, description: str, a
         color=discord.Color.red(),
         author=author,
     )
+
+
+async def make_dm_embed(
+    guild: discord.Guild,
+    title: str,
+    description: str,
+    image_url: str = None,
+    fields: list = None,
+) -> discord.Embed:
+    """
+    Make the embed sent to users about an action taken in the guild. The
+    server link and footer come from the cached guild metadata.
+    """
+    metadata = await guild_metadata.get(guild)
+    embed = make_embed(
+        title=title,
+        description=description,
+        image_url=image_url,
+        color=discord.Color.blurple(),
+        fields=[{"name": "Server:", "value": metadata.link, "inline": True}, *(fields or [])],
+    )
+    embed.set_footer(text=metadata.name, icon_url=metadata.icon_url or discord.Embed.Empty)
+    return embed
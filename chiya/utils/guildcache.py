@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from typing import NamedTuple, Optional
+
+import discord
+
+
+log = logging.getLogger(__name__)
+
+
+class GuildMetadata(NamedTuple):
+    """The guild details shown in direct messages to users."""
+
+    name: str
+    icon_url: Optional[str]
+    vanity_url: Optional[str]
+
+    @property
+    def link(self) -> str:
+        """
+        Returns the guild name as a markdown link to the vanity invite when
+        the guild has one.
+        """
+        return f"[{self.name}]({self.vanity_url})" if self.vanity_url else self.name
+
+
+class GuildMetadataCache:
+    """
+    Caches the name, icon and vanity invite of guilds so moderation DMs do
+    not fetch the vanity invite over REST on every action.
+
+    Entries expire after `ttl` seconds and are dropped on on_guild_update
+    so changes show up right away. Concurrent misses for the same guild share a
+    single fetch.
+    """
+
+    def __init__(self, ttl: int = 3600) -> None:
+        self.ttl = ttl
+        self._entries = {}
+        self._refreshing = {}
+
+    async def get(self, guild: discord.Guild) -> GuildMetadata:
+        """
+        Returns the cached metadata of the guild, refreshing it if stale.
+        """
+        entry = self._entries.get(guild.id)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        task = self._refreshing.get(guild.id)
+        if not task:
+            task = self._refreshing[guild.id] = asyncio.create_task(self._refresh(guild))
+            task.add_done_callback(lambda _: self._refreshing.pop(guild.id, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, guild: discord.Guild) -> GuildMetadata:
+        vanity_url = None
+        if "VANITY_URL" in guild.features:
+            try:
+                invite = await guild.vanity_invite()
+                vanity_url = invite.url if invite else None
+            except discord.HTTPException as e:
+                log.warning(f"Unable to fetch the vanity invite of {guild.name}: {e}")
+                # Keep serving the last known invite rather than dropping the link.
+                previous = self._entries.get(guild.id)
+                vanity_url = previous[0].vanity_url if previous else None
+
+        metadata = GuildMetadata(
+            name=guild.name,
+            icon_url=guild.icon.url if guild.icon else None,
+            vanity_url=vanity_url,
+        )
+        self._entries[guild.id] = (metadata, time.monotonic() + self.ttl)
+        return metadata
+
+    def invalidate(self, guild: discord.Guild) -> None:
+        """
+        Drops the cached metadata of the guild after it was updated. Guild
+        updates are rare and the event does not say whether the vanity invite
+        changed, so everything is refetched on next use.
+        """
+        self._entries.pop(guild.id, None)
+
+
+guild_metadata = GuildMetadataCache()
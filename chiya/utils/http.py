@@ -0,0 +1,38 @@
+import logging
+
+import aiohttp
+
+
+log = logging.getLogger(__name__)
+
+
+class SessionManager:
+    """
+    Owns the aiohttp session shared by every cog, so requests reuse pooled
+    connections instead of opening a new connector and TLS handshake each
+    time. The session is created on first use inside the event loop and
+    closed when the bot shuts down.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20, read_timeout: int = 30) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.read_timeout = read_timeout
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if not self._session or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, ttl_dns_cache=300),
+                # No total timeout so large downloads can stream, only stalled reads are cut off.
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=self.read_timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+sessions = SessionManager()
@@ -0,0 +1,137 @@
+import ast
+import glob
+import importlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from discord.ext import commands
+
+
+log = logging.getLogger(__name__)
+
+
+def feature_name(extension: str) -> str:
+    """
+    Returns the manifest key of an extension, "cogs.commands._ban" becomes
+    "commands.ban".
+    """
+    group, _, module = extension.removeprefix("cogs.").rpartition(".")
+    return f"{group}.{module.lstrip('_')}"
+
+
+def discover_extensions(root: str, manifest: dict = None) -> list:
+    """
+    Lists the cog extensions to load without importing any of them.
+
+    `manifest` maps feature names such as "commands.ban" to whether they
+    are enabled. Cogs missing from it keep the old default of loading only
+    modules that are not prefixed with an underscore.
+    """
+    manifest = manifest or {}
+    extensions = []
+    for path in sorted(glob.iglob(os.path.join("cogs", "**", "*.py"), root_dir=root, recursive=True)):
+        extension = path.replace("/", ".").replace("\\", ".").removesuffix(".py")
+        if extension.endswith("__init__"):
+            continue
+
+        default = not extension.rpartition(".")[2].startswith("_")
+        if manifest.get(feature_name(extension), default):
+            extensions.append(extension)
+
+    return extensions
+
+
+def parse_extension(root: str, extension: str) -> ast.Module:
+    path = os.path.join(root, *extension.split(".")) + ".py"
+    with open(path, encoding="utf8") as f:
+        return ast.parse(f.read(), filename=path)
+
+
+def required_config(root: str, extension: str) -> tuple:
+    """
+    Returns the optional config sections an extension lists in its
+    REQUIRED_CONFIG, e.g. ("roles", "channels.logs"). They are read from
+    the source because cogs use them as soon as they are imported.
+    """
+    for node in parse_extension(root, extension).body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "REQUIRED_CONFIG" for target in node.targets
+        ):
+            return tuple(ast.literal_eval(node.value))
+    return ()
+
+
+def import_dependencies(root: str, extension: str) -> None:
+    """
+    Imports the modules an extension imports at the top level, without
+    executing the extension itself.
+    """
+    tree = parse_extension(root, extension)
+
+    imports = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imports += [(alias.name, ()) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imports.append((node.module, [alias.name for alias in node.names]))
+
+    # Modules only importable later on are left to the serial load so any real error is reported there.
+    for module, names in imports:
+        try:
+            package = importlib.import_module(module)
+        except ImportError:
+            continue
+
+        # Names imported from a package may be submodules, e.g. "from chiya.utils import embeds". Names the package
+        # already defines are left alone, importing "chiya.config" would rebind the config object to the module.
+        for name in names:
+            if not hasattr(package, "__path__") or hasattr(package, name):
+                continue
+            try:
+                importlib.import_module(f"{module}.{name}")
+            except ImportError:
+                pass
+
+
+def load_extensions(bot: commands.Bot, root: str, extensions: list, workers: int = 4) -> None:
+    """
+    Imports the dependencies of the extensions in parallel and then loads
+    the extensions on the calling thread, logging how long each step took.
+
+    Dependency imports are mostly file and bytecode loading, so running them
+    in a thread pool overlaps that I/O. `load_extension()` executes the cog
+    itself, which is cheap once its imports are cached, and touches the bot
+    so it stays serial.
+    """
+
+    def timed_import(extension: str) -> float:
+        start = time.perf_counter()
+        try:
+            import_dependencies(root, extension)
+        except Exception:
+            # The same error comes up again when the extension is loaded, where it is reported.
+            log.debug(f"Unable to preload the dependencies of {extension}", exc_info=True)
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cog-import") as executor:
+        import_times = list(executor.map(timed_import, extensions))
+
+    rows = []
+    for extension, import_time in zip(extensions, import_times):
+        start = time.perf_counter()
+        try:
+            bot.load_extension(extension)
+            status = "ok"
+        except Exception:
+            log.exception(f"Failed to load {extension}")
+            status = "failed"
+        rows.append((extension, import_time * 1000, (time.perf_counter() - start) * 1000, status))
+
+    width = max((len(row[0]) for row in rows), default=9)
+    table = [f"{'Extension':<{width}}  {'Import':>9}  {'Setup':>9}  Status"]
+    for name, imported, setup, status in rows:
+        table.append(f"{name:<{width}}  {imported:>7.1f}ms  {setup:>7.1f}ms  {status}")
+    log.info(f"Loaded {len(rows)} extensions in {time.perf_counter() - started:.2f}s\n" + "\n".join(table))
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, NamedTuple
+
+import discord
+from discord.ext import commands
+
+
+log = logging.getLogger(__name__)
+
+TIMED_OUT = "timed_out"
+TIMEOUT_REMOVED = "timeout_removed"
+BOOST_STARTED = "boost_started"
+BOOST_STOPPED = "boost_stopped"
+ROLES_CHANGED = "roles_changed"
+
+
+class MemberDiff(NamedTuple):
+    """The transitions of a member update that subscribers care about."""
+
+    transitions: frozenset
+    roles_added: frozenset
+    roles_removed: frozenset
+
+
+def diff_member(before: discord.Member, after: discord.Member) -> MemberDiff:
+    """
+    Compares the fields subscribers are interested in once per update.
+    """
+    transitions = set()
+
+    if before.timed_out != after.timed_out:
+        transitions.add(TIMED_OUT if after.timed_out else TIMEOUT_REMOVED)
+
+    if bool(before.premium_since) != bool(after.premium_since):
+        transitions.add(BOOST_STARTED if after.premium_since else BOOST_STOPPED)
+
+    before_roles = frozenset(role.id for role in before.roles)
+    after_roles = frozenset(role.id for role in after.roles)
+    roles_added = after_roles - before_roles
+    roles_removed = before_roles - after_roles
+    if roles_added or roles_removed:
+        transitions.add(ROLES_CHANGED)
+
+    return MemberDiff(frozenset(transitions), roles_added, roles_removed)
+
+
+class MemberUpdateDispatcher:
+    """
+    A single on_member_update listener that diffs each update once and only
+    calls the subscribers of the transitions that happened, instead of every
+    cog comparing members on each nickname or avatar change.
+
+    Subscribers are coroutines taking `(before, after, diff)`. They run
+    concurrently and a failing subscriber does not affect the others.
+    """
+
+    def __init__(self) -> None:
+        self.bot = None
+        self._subscribers = defaultdict(list)
+
+    def subscribe(self, bot: commands.Bot, transition: str, handler: Callable) -> None:
+        """
+        Calls the handler whenever a member update contains the transition.
+        """
+        if not self.bot:
+            self.bot = bot
+            bot.add_listener(self._on_member_update, "on_member_update")
+        self._subscribers[transition].append(handler)
+
+    def unsubscribe(self, transition: str, handler: Callable) -> None:
+        """
+        Stops calling the handler, e.g. when its cog is unloaded.
+        """
+        if handler in self._subscribers[transition]:
+            self._subscribers[transition].remove(handler)
+
+    async def _on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        diff = diff_member(before, after)
+        # A handler subscribed to several transitions of the same update is only called once.
+        handlers = list(dict.fromkeys(h for transition in diff.transitions for h in self._subscribers[transition]))
+        if not handlers:
+            return
+
+        results = await asyncio.gather(*(handler(before, after, diff) for handler in handlers), return_exceptions=True)
+        for handler, result in zip(handlers, results):
+            if isinstance(result, Exception):
+                log.error(f"Member update subscriber {handler.__qualname__} failed", exc_info=result)
+
+
+member_updates = MemberUpdateDispatcher()
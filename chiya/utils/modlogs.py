@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+import dataset
+
+from chiya import database
+
+
+log = logging.getLogger(__name__)
+
+ACTION_TYPES = ("ban", "unban", "mute", "unmute", "warn", "note")
+
+
+class ModSummaryCache:
+    """
+    A per-user moderation summary (counts by type, last action and active
+    mute) kept in an LRU cache with write-through to the mod_summaries table.
+
+    Summaries are maintained incrementally whenever a mod action is logged so
+    staff lookups never have to aggregate the full mod_logs history. A user
+    without a stored summary is rebuilt from mod_logs. Summaries are only
+    persisted by the mod log writer's transaction, which sees its own
+    uncommitted rows, so a lookup can never write back a stale summary.
+
+    Batches are applied from the mod log writer's thread, so cache access is
+    serialized with a lock. The lock is never held around a query, so a
+    lookup from the event loop doesn't wait on a batch being written.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _remember(self, summary: dict) -> dict:
+        self._cache[summary["user_id"]] = summary
+        self._cache.move_to_end(summary["user_id"])
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return summary
+
+    def _rebuild(self, db: dataset.Database, user_id: int) -> dict:
+        """
+        Aggregates the summary from mod_logs with a single GROUP BY query.
+        """
+        summary = dict(user_id=user_id, last_action_type=None, last_action_timestamp=None, mute_until=None)
+        summary.update({f"{action_type}s": 0 for action_type in ACTION_TYPES})
+
+        counts = db.query(
+            "SELECT type, COUNT(*) AS count FROM mod_logs WHERE user_id = :user_id GROUP BY type",
+            user_id=user_id,
+        )
+        for row in counts:
+            if row["type"] in ACTION_TYPES:
+                summary[f"{row['type']}s"] = row["count"]
+
+        last = db["mod_logs"].find_one(user_id=user_id, order_by="-id")
+        if last:
+            summary["last_action_type"] = last["type"]
+            summary["last_action_timestamp"] = last["timestamp"]
+
+        return summary
+
+    def load(self, user_id: int) -> dict:
+        """
+        Reads the stored summary, rebuilding it from mod_logs if there is
+        none, and caches it without writing it back. Blocking, called from a
+        worker thread.
+        """
+        db = database.Database().get()
+        row = db["mod_summaries"].find_one(user_id=user_id)
+        summary = dict(row) if row else self._rebuild(db, user_id)
+        db.close()
+
+        with self._lock:
+            # A batch committed while this was loading holds the newer summary.
+            if user_id in self._cache:
+                self._cache.move_to_end(user_id)
+                return self._cache[user_id]
+            return self._remember(summary)
+
+    async def get(self, user_id: int) -> dict:
+        """
+        Returns the moderation summary for the user, loading it in a worker
+        thread on a cache miss.
+        """
+        with self._lock:
+            if user_id in self._cache:
+                self._cache.move_to_end(user_id)
+                return self._cache[user_id]
+        return await asyncio.to_thread(self.load, user_id)
+
+    def record(self, db: dataset.Database, actions: list) -> Callable[[], None]:
+        """
+        Applies a batch of freshly inserted mod_logs rows, as (row,
+        mute_until) pairs, to the users' summaries and writes them through
+        using the caller's connection, so the updates are committed together
+        with the inserts.
+
+        The changes are made to copies, the returned callable swaps them into
+        the cache and must only be called once the transaction committed. A
+        batch that is rolled back and retried then can't be counted twice.
+        """
+        updated = {}
+        rebuilt = set()
+        for action, mute_until in actions:
+            user_id = action["user_id"]
+            if user_id not in updated:
+                with self._lock:
+                    current = self._cache.get(user_id)
+                if current is None:
+                    row = db["mod_summaries"].find_one(user_id=user_id)
+                    current = dict(row) if row else None
+                if current is None:
+                    # The rebuild already sees every row of the batch inserted on this connection.
+                    updated[user_id] = self._rebuild(db, user_id)
+                    rebuilt.add(user_id)
+                else:
+                    updated[user_id] = dict(current)
+
+            summary = updated[user_id]
+            if user_id not in rebuilt:
+                summary[f"{action['type']}s"] = (summary.get(f"{action['type']}s") or 0) + 1
+
+            summary["last_action_type"] = action["type"]
+            summary["last_action_timestamp"] = action["timestamp"]
+            if action["type"] == "mute":
+                summary["mute_until"] = mute_until
+            elif action["type"] in ("unmute", "ban"):
+                summary["mute_until"] = None
+
+        for summary in updated.values():
+            db["mod_summaries"].upsert(summary, ["user_id"])
+
+        def commit() -> None:
+            with self._lock:
+                for summary in updated.values():
+                    self._remember(summary)
+
+        return commit
+
+summaries = ModSummaryCache()
+writer = database.ModLogWriter(on_insert=summaries.record)
+
+
+def log_mod_action(mute_until: int = None, need_id: bool = False, **fields) -> asyncio.Future:
+    """
+    Queues a mod_logs row on the write-behind writer, which also updates the
+    user's moderation summary once the row is written. Await the returned
+    future with `need_id` set to get the ID of the new row.
+    """
+    return writer.submit(fields, mute_until=mute_until, need_id=need_id)
+
+
+def format_summary(summary: dict) -> str:
+    """
+    Formats a moderation summary into a short block of text for embeds.
+    """
+    counts = [
+        f"{summary[f'{action_type}s']} {action_type}{'s' if summary[f'{action_type}s'] != 1 else ''}"
+        for action_type in ACTION_TYPES
+        if summary.get(f"{action_type}s")
+    ]
+    if not counts:
+        return "No previous mod actions."
+
+    summary_string = ", ".join(counts)
+
+    if summary.get("last_action_type"):
+        summary_string += f"\nLast action: {summary['last_action_type']} <t:{summary['last_action_timestamp']}:R>"
+
+    if summary.get("mute_until") and summary["mute_until"] > time.time():
+        summary_string += f"\nMuted until: <t:{summary['mute_until']}:F>"
+
+    return summary_string
@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import logging
+from typing import Union
+
+import discord
+
+
+log = logging.getLogger(__name__)
+
+NOTICE = (
+    "Unable to message {mention} about this action. "
+    "This can be caused by the user not being in the server, "
+    "having DMs disabled, or having the bot blocked."
+)
+
+
+class NotificationQueue:
+    """
+    Delivers moderation DMs in the background so actions and staff replies
+    do not wait on the DM endpoints.
+
+    `send()` enqueues a DM and returns a future resolving to whether it was
+    delivered. A small pool of workers sends them concurrently, urgent DMs
+    such as ban notices first since the action waits on them. py-cord
+    already waits out the rate limit of each DM channel route, so workers
+    only retry server errors with a backoff and give up right away when the
+    user cannot be messaged.
+    """
+
+    def __init__(self, workers: int = 4, max_attempts: int = 3, backoff: float = 2.0) -> None:
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._queue = None
+        self._sequence = itertools.count()
+        self._tasks = []
+        self._reports = set()
+
+    def _start(self) -> None:
+        if self._queue:
+            return
+
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def send(
+        self,
+        user: Union[discord.User, discord.Member],
+        embed: discord.Embed,
+        urgent: bool = False,
+    ) -> asyncio.Future:
+        """
+        Queues a DM to the user and returns a future resolving to True once
+        delivered or False if it could not be. Urgent DMs skip ahead of the
+        ones already queued.
+        """
+        self._start()
+        delivery = asyncio.get_running_loop().create_future()
+        # The sequence keeps DMs of the same priority in order and spares comparing the users.
+        self._queue.put_nowait((0 if urgent else 1, next(self._sequence), user, embed, delivery))
+        return delivery
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, user, embed, delivery = await self._queue.get()
+            try:
+                delivery.set_result(await self._deliver(user, embed))
+            except Exception:
+                log.exception(f"Unexpected error while messaging {user}")
+                delivery.set_result(False)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, user: Union[discord.User, discord.Member], embed: discord.Embed) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await user.send(embed=embed)
+                return True
+            except discord.Forbidden:
+                return False
+            except discord.HTTPException as e:
+                if e.status < 500 or attempt == self.max_attempts:
+                    log.warning(f"Unable to message {user}: {e}")
+                    return False
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        return False
+
+    def report(
+        self,
+        delivery: asyncio.Future,
+        message: discord.Message,
+        embed: discord.Embed,
+        user: Union[discord.User, discord.Member],
+    ) -> None:
+        """
+        Adds a notice to the mod log embed of the message once the DM turns
+        out to be undeliverable.
+        """
+
+        async def edit() -> None:
+            if await delivery:
+                return
+            embed.add_field(name="Notice:", value=NOTICE.format(mention=user.mention))
+            try:
+                await message.edit(embed=embed)
+            except discord.HTTPException as e:
+                log.warning(f"Unable to report the failed DM to {user}: {e}")
+
+        task = asyncio.create_task(edit())
+        self._reports.add(task)
+        task.add_done_callback(self._reports.discard)
+
+
+notifications = NotificationQueue()
@@ -1,12 +1,18 @@
 import asyncio
+import inspect
 import logging
+import sys
 import typing
+from collections import OrderedDict
 
 import discord
 from discord.abc import User
 from discord.commands import context
 from discord.ext.commands import Paginator
 
+from chiya import database
+from chiya.utils.router import router
+
 
 FIRST_EMOJI = "\u23EE"  # [:track_previous:]
 LEFT_EMOJI = "\u2B05"  # [:arrow_left:]
@@ -25,6 +31,122 @@ class EmptyPaginatorEmbed(Exception):
     pass
 
 
+class PageSource:
+    """The protocol ButtonPaginator uses to request pages.
+
+    Subclasses implement `get_page`, which may be a regular or a coroutine method, returning the content of the page
+    at a zero-based index or None past the last page. `get_page_count` can be overridden when the total number of
+    pages is cheap to know so that the paginator can show it and jump to the last page.
+    """
+
+    def get_page(self, index: int) -> typing.Union[typing.Optional[str], typing.Awaitable[typing.Optional[str]]]:
+        raise NotImplementedError
+
+    async def get_page_count(self) -> typing.Optional[int]:
+        return None
+
+
+class QueryPageSource(PageSource):
+    """A page source that fetches a page's worth of rows from a dataset table with LIMIT/OFFSET.
+
+    Rows are formatted with `formatter` and joined with `separator`. `filters` are passed to `Table.find()` as is.
+    The total is counted with a single COUNT(*) unless it is passed as `total` or `count` is disabled.
+    Queries run in a worker thread to keep them off the event loop.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        formatter: typing.Callable[[dict], str],
+        per_page: int = 5,
+        order_by: typing.Union[str, typing.List[str]] = "id",
+        separator: str = "\n\n",
+        total: typing.Optional[int] = None,
+        count: bool = True,
+        **filters,
+    ) -> None:
+        self.table = table
+        self.formatter = formatter
+        self.per_page = per_page
+        self.order_by = order_by
+        self.separator = separator
+        self.total = total
+        self.count = count
+        self.filters = filters
+
+    def fetch_rows(self, index: int) -> typing.List[dict]:
+        """Fetch the rows of the page at `index`. Blocking, called from a worker thread."""
+        db = database.Database().get()
+        rows = list(
+            db[self.table].find(
+                **self.filters,
+                order_by=self.order_by,
+                _limit=self.per_page,
+                _offset=index * self.per_page,
+            )
+        )
+        db.close()
+        return rows
+
+    def count_rows(self) -> int:
+        """Count every row matching the filters. Blocking, called from a worker thread."""
+        db = database.Database().get()
+        total = db[self.table].count(**self.filters)
+        db.close()
+        return total
+
+    async def get_page(self, index: int) -> typing.Optional[str]:
+        rows = await asyncio.to_thread(self.fetch_rows, index)
+        if not rows:
+            return None
+        return self.separator.join(self.formatter(row) for row in rows)
+
+    async def get_page_count(self) -> typing.Optional[int]:
+        if self.total is None and self.count:
+            self.total = await asyncio.to_thread(self.count_rows)
+        if self.total is None:
+            return None
+        return -(-self.total // self.per_page)
+
+
+class KeysetPageSource(QueryPageSource):
+    """A QueryPageSource that seeks on `key` instead of using OFFSET.
+
+    The last key of every fetched page is remembered, so the following page is fetched with `key < last seen`
+    (or `>` when ascending) and stays cheap however deep the pagination goes. Pages that are jumped to without
+    knowing their boundary, such as the last page, fall back to a single OFFSET query.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        formatter: typing.Callable[[dict], str],
+        key: str = "id",
+        descending: bool = True,
+        **kwargs,
+    ) -> None:
+        super().__init__(table, formatter, order_by=f"-{key}" if descending else key, **kwargs)
+        self.key = key
+        self.descending = descending
+        self.cursors = {0: None}
+
+    def fetch_rows(self, index: int) -> typing.List[dict]:
+        if index not in self.cursors:
+            rows = super().fetch_rows(index)
+        else:
+            filters = dict(self.filters)
+            if self.cursors[index] is not None:
+                filters[self.key] = {"<" if self.descending else ">": self.cursors[index]}
+
+            db = database.Database().get()
+            rows = list(db[self.table].find(**filters, order_by=self.order_by, _limit=self.per_page))
+            db.close()
+
+        if rows:
+            self.cursors[index + 1] = rows[-1][self.key]
+        return rows
+
+
 class LinePaginator(Paginator):
     """A class that aids in paginating code blocks for Discord messages.
 
@@ -195,14 +317,13 @@ class LinePaginator(Paginator):
         linesep: str = "\n",
     ) -> typing.Optional[discord.Message]:
         """
-        Use a paginator and set of reactions to provide pagination over a set of lines.
+        Use a paginator and a set of buttons to provide pagination over a set of lines.
 
-        The reactions are used to switch page, or to finish with pagination.
+        The buttons are used to switch page, or to finish with pagination.
 
-        When used, this will send a message using `ctx.send()` and apply a set of reactions to it. These reactions may
-        be used to change page, or to remove pagination from the message.
+        When used, this will send a message using `ctx.send_followup()` with a ButtonPaginator view attached.
 
-        Pagination will also be removed automatically if no reaction is added for five minutes (300 seconds).
+        Pagination will also be removed automatically if no button is pressed for five minutes (300 seconds).
 
         Example:
         >embed = discord.Embed()
@@ -211,32 +332,6 @@ class LinePaginator(Paginator):
 
         >await LinePaginator.paginate([line for line in lines], ctx, embed)
         """
-
-        def event_check(reaction_: discord.Reaction, user_: discord.Member) -> bool:
-            """Make sure that this reaction is what we want to operate on."""
-            no_restrictions = (
-                # Pagination is not restricted
-                not restrict_to_user
-                # The reaction was by a whitelisted user
-                or user_.id == restrict_to_user.id
-            )
-
-            return (
-                # Conditions for a successful pagination:
-                all(
-                    (
-                        # Reaction is on this message
-                        reaction_.message.id == message.id,
-                        # Reaction is one of the pagination emotes
-                        str(reaction_.emoji) in PAGINATION_EMOJI,
-                        # Reaction was not made by the Bot
-                        user_.id != ctx.bot.user.id,
-                        # There were no restrictions
-                        no_restrictions,
-                    )
-                )
-            )
-
         paginator = cls(
             prefix=prefix,
             suffix=suffix,
@@ -245,7 +340,6 @@ class LinePaginator(Paginator):
             scale_to_size=scale_to_size,
             linesep=linesep,
         )
-        current_page = 0
 
         if not lines:
             if exception_on_empty_embed:
@@ -253,7 +347,7 @@ class LinePaginator(Paginator):
                 raise EmptyPaginatorEmbed("No lines to paginate")
 
             log.debug("No lines to add to paginator, adding '(nothing to display)' message")
-            lines.append("(nothing to display)")
+            lines = ["(nothing to display)"]
 
         for line in lines:
             try:
@@ -262,114 +356,191 @@ class LinePaginator(Paginator):
                 log.exception(f"Failed to add line to paginator: '{line}'")
                 raise  # Should propagate
 
-        log.debug(f"Paginator created with {len(paginator.pages)} pages")
-
-        embed.description = paginator.pages[current_page]
-
-        if len(paginator.pages) <= 1:
-            if footer_text:
-                embed.set_footer(text=footer_text)
-
-            if url:
-                embed.url = url
-
-            log.debug("There's less than two pages, so we won't paginate - sending single page on its own")
-            return await ctx.send_followup(embed=embed, delete_after=time_to_delete)
-        else:
-            if footer_text:
-                embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-            else:
-                embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-
-            if url:
-                embed.url = url
-
-            log.debug("Sending first page to channel...")
-            message = await ctx.send_followup(embed=embed, delete_after=time_to_delete)
-
-        log.debug("Adding emoji reactions to message...")
-
-        for emoji in PAGINATION_EMOJI:
-            # Add all the applicable emoji to the message
-            await message.add_reaction(emoji)
-
-        while True:
-            try:
-                reaction, user = await ctx.bot.wait_for("reaction_add", timeout=timeout, check=event_check)
-            except asyncio.TimeoutError:
-                log.debug("Timed out waiting for a reaction")
-                break  # We're done, no reactions for the last 5 minutes
-
-            if str(reaction.emoji) == DELETE_EMOJI:
-                log.debug("Got delete reaction")
-                return await message.delete()
-
-            if reaction.emoji == FIRST_EMOJI:
-                await message.remove_reaction(reaction.emoji, user)
-                current_page = 0
-
-                log.debug(f"Got first page reaction - changing to page 1/{len(paginator.pages)}")
-
-                embed.description = paginator.pages[current_page]
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-                await message.edit(embed=embed)
-
-            if reaction.emoji == LAST_EMOJI:
-                await message.remove_reaction(reaction.emoji, user)
-                current_page = len(paginator.pages) - 1
-
-                log.debug(f"Got last page reaction - changing to page {current_page + 1}/{len(paginator.pages)}")
-
-                embed.description = paginator.pages[current_page]
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-                await message.edit(embed=embed)
-
-            if reaction.emoji == LEFT_EMOJI:
-                await message.remove_reaction(reaction.emoji, user)
+        # The lines are already in memory, so splitting them up front is cheap and gives the page count.
+        pages = paginator.pages
+
+        view = ButtonPaginator(
+            lambda index: pages[index] if index < len(pages) else None,
+            embed=embed,
+            restrict_to_user=restrict_to_user,
+            timeout=timeout,
+            footer_text=footer_text,
+            url=url,
+            page_count=len(pages),
+        )
+        return await view.start(ctx, time_to_delete=time_to_delete)
 
-                if current_page <= 0:
-                    log.debug("Got previous page reaction, but we're on the first page - ignoring")
-                    continue
 
-                current_page -= 1
-                log.debug(f"Got previous page reaction - changing to page {current_page + 1}/{len(paginator.pages)}")
+class ButtonPaginator(discord.ui.View):
+    """A button based paginator that renders pages lazily.
 
-                embed.description = paginator.pages[current_page]
+    `source` can either be a PageSource, an async iterator yielding the content of each page in order, or a callable
+    taking a zero-based page index and returning the content of that page, or an awaitable resolving to it (None
+    past the end).
 
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
+    Pages pulled from an iterator are kept since they cannot be requested again. Pages fetched from a callable are
+    kept in a small LRU cache so flipping back and forth does not refetch them.
 
-                await message.edit(embed=embed)
+    Every page turn is answered with a single message edit through the interaction response. The view itself has no
+    timeout, the message router expires it instead so idle paginators don't each keep a timer running.
+    """
 
-            if reaction.emoji == RIGHT_EMOJI:
-                await message.remove_reaction(reaction.emoji, user)
+    def __init__(
+        self,
+        source: typing.Union[PageSource, typing.AsyncIterator[str], typing.Callable[[int], typing.Any]],
+        embed: discord.Embed,
+        restrict_to_user: User = None,
+        timeout: int = 300,
+        footer_text: str = None,
+        url: str = None,
+        page_count: typing.Optional[int] = None,
+        cache_size: int = 8,
+    ) -> None:
+        super().__init__(timeout=None)
+        self.expires_after = timeout
+        self.embed = embed
+        self.restrict_to_user = restrict_to_user
+        self.footer_text = footer_text
+        self.url = url
+        self.page_count = page_count
+        self.cache_size = cache_size
+        self.current_page = 0
+        self.message = None
+        self._source = source if isinstance(source, PageSource) else None
+
+        if hasattr(source, "__anext__"):
+            self._iterator = source
+            self._fetch = None
+            self._pages = []
+        else:
+            self._iterator = None
+            self._fetch = self._source.get_page if self._source else source
+            self._pages = OrderedDict()
+
+    async def get_page(self, index: int) -> typing.Optional[str]:
+        """Return the content of the page at `index`, or None if there is no such page."""
+        if index < 0 or (self.page_count is not None and index >= self.page_count):
+            return None
+
+        if self._iterator:
+            while len(self._pages) <= index:
+                try:
+                    self._pages.append(await self._iterator.__anext__())
+                except StopAsyncIteration:
+                    self.page_count = len(self._pages)
+                    return None
+            return self._pages[index]
+
+        if index in self._pages:
+            self._pages.move_to_end(index)
+            return self._pages[index]
+
+        content = self._fetch(index)
+        if inspect.isawaitable(content):
+            content = await content
+        if content is None:
+            self.page_count = index
+            return None
+
+        self._pages[index] = content
+        if len(self._pages) > self.cache_size:
+            self._pages.popitem(last=False)
+        return content
+
+    def render(self, content: str) -> discord.Embed:
+        """Render the current page into the embed and update the button states."""
+        page_number = f"Page {self.current_page + 1}"
+        if self.page_count is not None:
+            page_number += f"/{self.page_count}"
+
+        self.embed.description = content
+        self.embed.set_footer(text=f"{self.footer_text} ({page_number})" if self.footer_text else page_number)
+        if self.url:
+            self.embed.url = self.url
+
+        is_last = self.page_count is not None and self.current_page >= self.page_count - 1
+        self.first_page.disabled = self.previous_page.disabled = self.current_page == 0
+        self.next_page.disabled = is_last
+        self.last_page.disabled = is_last or (self.page_count is None and not self._iterator)
+        return self.embed
+
+    async def start(self, ctx: context.ApplicationContext, time_to_delete: int = None) -> discord.Message:
+        """Send the first page, attaching the buttons only if there is more than one page."""
+        if self.page_count is None and self._source:
+            self.page_count = await self._source.get_page_count()
+
+        content = await self.get_page(0)
+
+        if self.page_count is not None:
+            single_page = self.page_count <= 1
+        else:
+            single_page = await self.get_page(1) is None
 
-                if current_page >= len(paginator.pages) - 1:
-                    log.debug("Got next page reaction, but we're on the last page - ignoring")
-                    continue
+        if single_page:
+            if self.footer_text:
+                self.embed.set_footer(text=self.footer_text)
+            if self.url:
+                self.embed.url = self.url
 
-                current_page += 1
-                log.debug(f"Got next page reaction - changing to page {current_page + 1}/{len(paginator.pages)}")
+            self.embed.description = content or "(nothing to display)"
+            self.stop()
 
-                embed.description = paginator.pages[current_page]
+            log.debug("There's less than two pages, so we won't paginate - sending single page on its own")
+            return await ctx.send_followup(embed=self.embed, delete_after=time_to_delete)
+
+        log.debug("Sending first page to channel...")
+        self.message = await ctx.send_followup(embed=self.render(content), view=self, delete_after=time_to_delete)
+        router.register(ctx.bot, self.message.id, self, timeout=self.expires_after)
+        return self.message
+
+    async def show_page(self, interaction: discord.Interaction, index: int) -> None:
+        """Switch to the page at `index` if it exists, with a single edit of the message."""
+        content = await self.get_page(index)
+        if content is not None:
+            self.current_page = index
+        else:
+            log.debug(f"Got a request for page {index + 1} which does not exist - ignoring")
+            content = await self.get_page(self.current_page)
 
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
+        router.touch(self.message.id)
+        await interaction.response.edit_message(embed=self.render(content), view=self)
 
-                await message.edit(embed=embed)
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Make sure that this interaction is one we want to operate on."""
+        return not self.restrict_to_user or interaction.user.id == self.restrict_to_user.id
 
-        log.debug("Ending pagination and clearing reactions.")
-        try:
-            await message.clear_reactions()
-        except discord.NotFound:
-            pass  # do nothing
+    async def on_timeout(self) -> None:
+        log.debug("Ending pagination and removing the buttons.")
+        self.stop()
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.NotFound:
+                pass  # do nothing
+
+    @discord.ui.button(emoji=FIRST_EMOJI, style=discord.ButtonStyle.secondary)
+    async def first_page(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        await self.show_page(interaction, 0)
+
+    @discord.ui.button(emoji=LEFT_EMOJI, style=discord.ButtonStyle.secondary)
+    async def previous_page(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        await self.show_page(interaction, self.current_page - 1)
+
+    @discord.ui.button(emoji=RIGHT_EMOJI, style=discord.ButtonStyle.secondary)
+    async def next_page(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        await self.show_page(interaction, self.current_page + 1)
+
+    @discord.ui.button(emoji=LAST_EMOJI, style=discord.ButtonStyle.secondary)
+    async def last_page(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        if self.page_count is None:
+            # Only iterator sources can get here, drain them to find the last page.
+            await self.get_page(sys.maxsize)
+        await self.show_page(interaction, self.page_count - 1)
+
+    @discord.ui.button(emoji=DELETE_EMOJI, style=discord.ButtonStyle.danger)
+    async def delete(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
+        log.debug("Got delete button")
+        router.unregister(self.message.id)
+        self.stop()
+        await interaction.response.defer()
+        await interaction.message.delete()
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+import discord
+
+
+log = logging.getLogger(__name__)
+
+# Discord rejects bulk deletes of messages older than 14 days, the margin covers clock drift.
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+BULK_DELETE_SIZE = 100
+
+
+class PurgeFilter(NamedTuple):
+    """The messages a purge applies to. Unset fields match everything."""
+
+    author_id: Optional[int] = None
+    pattern: Optional[re.Pattern] = None
+    attachments: bool = False
+    after: Optional[datetime] = None
+
+    def matches(self, message: discord.Message) -> bool:
+        if message.pinned:
+            return False
+        if self.author_id and message.author.id != self.author_id:
+            return False
+        if self.attachments and not message.attachments:
+            return False
+        if self.pattern and not self.pattern.search(message.content):
+            return False
+        return True
+
+
+class ChannelProgress:
+    """Counters for one channel of a purge."""
+
+    __slots__ = ("channel", "scanned", "deleted", "failed", "resume_id", "done")
+
+    def __init__(self, channel: discord.TextChannel) -> None:
+        self.channel = channel
+        self.scanned = 0
+        self.deleted = 0
+        self.failed = 0
+        self.resume_id = None
+        self.done = False
+
+
+class PurgeJob:
+    """
+    Deletes up to `limit` matching messages from each channel, newest
+    first, starting before `before`.
+
+    History is streamed page by page rather than loaded up front and
+    matching messages are deleted in bulk batches of 100, falling back to
+    single deletes for messages too old for the bulk endpoint. Channels are
+    purged concurrently. Each channel records the oldest message it got
+    through, so a cancelled or failed purge can be resumed from there.
+    """
+
+    def __init__(
+        self,
+        channels: list,
+        purge_filter: PurgeFilter,
+        limit: int,
+        before: discord.abc.Snowflake,
+        reason: str = None,
+    ) -> None:
+        self.purge_filter = purge_filter
+        self.limit = limit
+        self.before = before
+        self.reason = reason
+        self.progress = [ChannelProgress(channel) for channel in channels]
+        self.cancelled = False
+        self._task = None
+
+    @property
+    def deleted(self) -> int:
+        return sum(progress.deleted for progress in self.progress)
+
+    @property
+    def scanned(self) -> int:
+        return sum(progress.scanned for progress in self.progress)
+
+    async def run(self) -> None:
+        """
+        Purges every channel. Returns early, keeping the progress made so
+        far, if the job is cancelled.
+        """
+        self._task = asyncio.gather(*(self._purge_channel(progress) for progress in self.progress))
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            if not self.cancelled:
+                raise
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self._task:
+            self._task.cancel()
+
+    async def _purge_channel(self, progress: ChannelProgress) -> None:
+        batch = []
+        try:
+            history = progress.channel.history(
+                limit=None,
+                before=self.before,
+                after=self.purge_filter.after,
+                oldest_first=False,
+            )
+            async for message in history:
+                progress.scanned += 1
+                if self.purge_filter.matches(message):
+                    batch.append(message)
+
+                if len(batch) == BULK_DELETE_SIZE:
+                    await self._delete(progress, batch)
+                    batch = []
+
+                if progress.deleted + len(batch) >= self.limit:
+                    break
+
+            if batch:
+                await self._delete(progress, batch)
+            progress.done = True
+        except discord.HTTPException as e:
+            log.warning(f"Purge of #{progress.channel} stopped: {e}")
+
+    async def _delete(self, progress: ChannelProgress, messages: list) -> None:
+        """
+        Deletes a batch of messages and moves the resume point past them.
+        """
+        cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        recent = [message for message in messages if message.created_at > cutoff]
+        old = [message for message in messages if message.created_at <= cutoff]
+
+        if len(recent) > 1:
+            await progress.channel.delete_messages(recent, reason=self.reason)
+            progress.deleted += len(recent)
+        else:
+            old = recent + old
+
+        for message in old:
+            try:
+                await message.delete(reason=self.reason)
+                progress.deleted += 1
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                log.warning(f"Unable to delete message {message.id} in #{progress.channel}: {e}")
+                progress.failed += 1
+
+        progress.resume_id = messages[-1].id
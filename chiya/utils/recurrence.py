@@ -0,0 +1,131 @@
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from chiya.utils.timeparse import parse_duration
+
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+INTERVAL_REGEX = re.compile(r"^every\s+(?P<duration>.+)$")
+WEEKLY_REGEX = re.compile(r"^(?:every\s+)?(?P<days>[a-z,\s]+?)\s+at\s+(?P<hour>\d{1,2}):(?P<minute>\d{2})$")
+
+# Shorthands for common sets of days, as bitmasks with Monday as the lowest bit.
+DAY_GROUPS = {
+    "day": 0b1111111,
+    "days": 0b1111111,
+    "daily": 0b1111111,
+    "weekday": 0b0011111,
+    "weekdays": 0b0011111,
+    "weekend": 0b1100000,
+    "weekends": 0b1100000,
+}
+
+
+def parse_recurrence(text: str) -> Optional[str]:
+    """
+    Parses a user supplied recurrence into a compact rule string, or None
+    if it could not be parsed.
+
+    Supports fixed intervals ("every 2d", "every 12 hours") stored as
+    "i:<seconds>" and days of the week at a time in UTC ("daily at 09:00",
+    "weekdays at 18:30", "mon,thu at 7:00") stored as "w:<mask>:<HH>:<MM>".
+    """
+    text = text.strip().lower()
+
+    if match := WEEKLY_REGEX.match(text):
+        hour, minute = int(match["hour"]), int(match["minute"])
+        if hour > 23 or minute > 59:
+            return None
+
+        mask = 0
+        for day in re.split(r"[,\s]+", match["days"].strip()):
+            if day in ("and", ""):
+                continue
+            if day in DAY_GROUPS:
+                mask |= DAY_GROUPS[day]
+            elif day[:3] in WEEKDAYS:
+                mask |= 1 << WEEKDAYS.index(day[:3])
+            else:
+                return None
+
+        return f"w:{mask}:{hour:02}:{minute:02}" if mask else None
+
+    if match := INTERVAL_REGEX.match(text):
+        parsed = parse_duration(match["duration"])
+        # Anything shorter than a minute would just spam the channel.
+        if not parsed or parsed[0] < 60:
+            return None
+        return f"i:{parsed[0]}"
+
+    return None
+
+
+def next_occurrence(rule: str, after: int, now: int = None) -> int:
+    """
+    Returns the first occurrence of the rule strictly after `after` that is
+    also in the future, without walking through every missed occurrence.
+    """
+    now = int(time.time()) if now is None else now
+    after = max(after, now)
+    kind, _, value = rule.partition(":")
+
+    if kind == "i":
+        interval = int(value)
+        return after + interval
+
+    mask, hour, minute = (int(part) for part in value.split(":"))
+    start = datetime.fromtimestamp(after, tz=timezone.utc)
+    candidate = start.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    for _ in range(8):
+        if candidate.timestamp() > after and mask & (1 << candidate.weekday()):
+            return int(candidate.timestamp())
+        candidate += timedelta(days=1)
+
+    raise ValueError(f"Recurrence rule {rule!r} never occurs")
+
+
+def catch_up(rule: str, due: int, now: int = None) -> int:
+    """
+    Returns the next occurrence after a delivered one that was due at
+    `due`. Interval rules keep their phase, skipping any occurrences missed
+    while the bot was offline in constant time.
+    """
+    now = int(time.time()) if now is None else now
+    kind, _, value = rule.partition(":")
+
+    if kind == "i":
+        interval = int(value)
+        return due + interval * max(1, (now - due) // interval + 1)
+
+    return next_occurrence(rule, due, now)
+
+
+def describe_recurrence(rule: str) -> str:
+    """
+    Formats a rule string back into a readable description.
+    """
+    kind, _, value = rule.partition(":")
+
+    if kind == "i":
+        remaining = int(value)
+        parts = []
+        for unit, seconds in (("week", 604800), ("day", 86400), ("hour", 3600), ("minute", 60), ("second", 1)):
+            amount, remaining = divmod(remaining, seconds)
+            if amount:
+                parts.append(f"{amount} {unit}{'s' if amount != 1 else ''}")
+        return f"every {' '.join(parts)}"
+
+    mask, hour, minute = value.split(":")
+    mask = int(mask)
+    if mask == DAY_GROUPS["daily"]:
+        days = "daily"
+    elif mask == DAY_GROUPS["weekdays"]:
+        days = "weekdays"
+    elif mask == DAY_GROUPS["weekends"]:
+        days = "weekends"
+    else:
+        days = ", ".join(day.capitalize() for index, day in enumerate(WEEKDAYS) if mask & (1 << index))
+
+    return f"{days} at {hour}:{minute} UTC"
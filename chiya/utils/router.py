@@ -0,0 +1,139 @@
+import asyncio
+import heapq
+import logging
+import typing
+
+import discord
+from discord.ext import commands
+
+
+log = logging.getLogger(__name__)
+
+
+class Route:
+    """An interactive message registered with the router."""
+
+    __slots__ = ("handler", "timeout", "deadline")
+
+    def __init__(self, handler: typing.Any, timeout: typing.Optional[float]) -> None:
+        self.handler = handler
+        self.timeout = timeout
+        self.deadline = None
+
+
+class MessageRouter:
+    """
+    Routes events for interactive messages (paginators, prompts) to their
+    handler by message ID and expires them from a single deadline heap.
+
+    Handlers are plain objects. `on_reaction(payload)` is called for raw
+    reactions added to the registered message by anyone but the bot and
+    `on_timeout()` is called once the message has been idle for its timeout.
+    Both are optional coroutines. Button presses are already dispatched by
+    message ID through py-cord's view store, so views only need to register
+    for the timeout bookkeeping and refresh it with `touch()`.
+
+    A single background task sleeps until the earliest deadline instead of
+    every waiter owning its own timer, and the reaction listener does one
+    dict lookup per reaction regardless of how many messages are active.
+    """
+
+    def __init__(self) -> None:
+        self.bot = None
+        self._routes = {}
+        self._deadlines = []
+        self._wakeup = None
+        self._task = None
+        self._pending = set()
+
+    def _attach(self, bot: commands.Bot) -> None:
+        """
+        Hooks the router into the bot the first time something registers.
+        """
+        if self.bot:
+            return
+
+        self.bot = bot
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._expire_routes())
+        bot.add_listener(self._on_raw_reaction_add, "on_raw_reaction_add")
+
+    def _schedule(self, message_id: int, route: Route) -> None:
+        route.deadline = asyncio.get_running_loop().time() + route.timeout
+        if not self._deadlines or route.deadline < self._deadlines[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._deadlines, (route.deadline, message_id))
+
+    def register(self, bot: commands.Bot, message_id: int, handler: typing.Any, timeout: float = None) -> None:
+        """
+        Starts routing the events of a message to the handler.
+        """
+        self._attach(bot)
+        route = self._routes[message_id] = Route(handler, timeout)
+        if timeout is not None:
+            self._schedule(message_id, route)
+
+    def touch(self, message_id: int) -> None:
+        """
+        Pushes back the timeout of a message after it was interacted with.
+        """
+        route = self._routes.get(message_id)
+        if route and route.timeout is not None:
+            # The previous heap entry is left in place and skipped once it no longer matches the deadline.
+            self._schedule(message_id, route)
+
+    def unregister(self, message_id: int) -> None:
+        """
+        Stops routing the events of a message without calling its timeout.
+        """
+        self._routes.pop(message_id, None)
+
+    async def _on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
+        route = self._routes.get(payload.message_id)
+        if not route or payload.user_id == self.bot.user.id or not hasattr(route.handler, "on_reaction"):
+            return
+
+        self.touch(payload.message_id)
+        await route.handler.on_reaction(payload)
+
+    async def _expire_routes(self) -> None:
+        """
+        Sleeps until the earliest deadline and times out the expired routes.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._deadlines:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            deadline, message_id = self._deadlines[0]
+            delay = deadline - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            heapq.heappop(self._deadlines)
+            route = self._routes.get(message_id)
+            if not route or route.deadline != deadline:
+                continue
+
+            del self._routes[message_id]
+            if hasattr(route.handler, "on_timeout"):
+                # Run the handler separately so a slow edit does not hold up the other expiries.
+                task = asyncio.create_task(self._call_timeout(message_id, route.handler))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    async def _call_timeout(self, message_id: int, handler: typing.Any) -> None:
+        try:
+            await handler.on_timeout()
+        except Exception:
+            log.exception(f"Timeout handler for message {message_id} failed")
+
+
+router = MessageRouter()
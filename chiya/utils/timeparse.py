@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import parsedatetime
+
+from chiya import database
+
+
+log = logging.getLogger(__name__)
+
+DURATION_REGEX = re.compile(
+    r"(?:(?P<years>\d+)\s*y(?:ears|ear|rs|r)?)?\s*"
+    r"(?:(?P<months>\d+)\s*mo(?:nths|nth)?)?\s*"
+    r"(?:(?P<weeks>\d+)\s*w(?:eeks|eek|ks|k)?)?\s*"
+    r"(?:(?P<days>\d+)\s*d(?:ays|ay)?)?\s*"
+    r"(?:(?P<hours>\d+)\s*h(?:ours|our|rs|r)?)?\s*"
+    r"(?:(?P<minutes>\d+)\s*m(?:inutes|inute|ins|in)?)?\s*"
+    r"(?:(?P<seconds>\d+)\s*s(?:econds|econd|ecs|ec)?)?"
+)
+ABSOLUTE_REGEX = re.compile(r"(?P<date>\d{4}-\d{2}-\d{2})(?:[ T](?P<time>\d{1,2}:\d{2}))?")
+
+# Converting 1 year = 365 days and 1 month = 30 days since they're not natively supported.
+UNIT_SECONDS = dict(
+    years=365 * 86400,
+    months=30 * 86400,
+    weeks=7 * 86400,
+    days=86400,
+    hours=3600,
+    minutes=60,
+    seconds=1,
+)
+
+# The timezone each user has set, filled in as they're looked up.
+_timezones: dict[int, str] = {}
+
+# Building a Calendar loads its locale tables, so a single instance is shared.
+calendar = parsedatetime.Calendar(version=parsedatetime.VERSION_CONTEXT_STYLE)
+
+
+class ParsedTime(NamedTuple):
+    """The result of parsing a user supplied time."""
+
+    end_time: int
+    description: str
+    absolute: bool
+
+
+@lru_cache(maxsize=256)
+def parse_duration(duration: str) -> Optional[tuple]:
+    """
+    Parses a relative duration such as "1d12h" into its length in seconds
+    and a readable description, or None if it is not a duration.
+
+    Results only depend on the input, so they are memoized.
+    """
+    match = DURATION_REGEX.fullmatch(duration.strip().lower())
+    if not match or not any(match.groupdict().values()):
+        return None
+
+    seconds = 0
+    description = []
+    for unit, value in match.groupdict().items():
+        if not value or not int(value):
+            continue
+        seconds += int(value) * UNIT_SECONDS[unit]
+        # If the time value is 1, make the time unit into singular form and plural otherwise.
+        description.append(f"{int(value)} {unit[:-1] if int(value) == 1 else unit}")
+
+    if not seconds:
+        return None
+
+    return seconds, " ".join(description)
+
+
+@lru_cache(maxsize=256)
+def parse_absolute(text: str, tz: str) -> Optional[int]:
+    """
+    Parses an absolute "YYYY-MM-DD" or "YYYY-MM-DD HH:MM" date in the given
+    timezone into a unix timestamp. Memoized since the result is fixed.
+    """
+    match = ABSOLUTE_REGEX.fullmatch(text.strip())
+    if not match:
+        return None
+
+    try:
+        moment = datetime.strptime(f"{match['date']} {match['time'] or '00:00'}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
+
+    return int(moment.replace(tzinfo=ZoneInfo(tz)).timestamp())
+
+
+def parse_natural(text: str, tz: str) -> Optional[int]:
+    """
+    Parses natural language such as "tomorrow 9am" relative to the current
+    time in the given timezone. Not memoized since it depends on the time.
+    """
+    zone = ZoneInfo(tz)
+    moment, context = calendar.parseDT(text, sourceTime=datetime.now(tz=zone), tzinfo=zone)
+    if not context.hasDateOrTime:
+        return None
+    return int(moment.timestamp())
+
+
+def parse_time(text: str, tz: str = "UTC") -> Optional[ParsedTime]:
+    """
+    Parses a relative duration ("2h30m"), an absolute date ("2026-12-01
+    18:00") or natural language ("tomorrow 9am") into a ParsedTime in the
+    future. Absolute times are read in the `tz` timezone. Returns None if
+    the input could not be parsed or is not in the future.
+    """
+    now = int(time.time())
+
+    if duration := parse_duration(text):
+        seconds, description = duration
+        try:
+            # Reject values datetime can't represent instead of clamping every unit.
+            datetime.fromtimestamp(now + seconds, tz=timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return None
+        return ParsedTime(end_time=now + seconds, description=description, absolute=False)
+
+    end_time = parse_absolute(text, tz) or parse_natural(text, tz)
+    if not end_time or end_time <= now:
+        return None
+
+    description = f"<t:{end_time}:F>"
+    return ParsedTime(end_time=end_time, description=description, absolute=True)
+
+
+def _load_user_timezone(user_id: int) -> str:
+    db = database.Database().get()
+    settings = db["user_settings"].find_one(user_id=user_id)
+    db.close()
+    return settings["timezone"] if settings and settings["timezone"] else "UTC"
+
+
+async def get_user_timezone(user_id: int) -> str:
+    """
+    Returns the IANA timezone name the user has set, or UTC. Each user's
+    timezone is read once and set_user_timezone keeps the cache current.
+    """
+    if user_id not in _timezones:
+        loaded = await asyncio.to_thread(_load_user_timezone, user_id)
+        # A timezone set while the lookup ran is newer than what it read.
+        _timezones.setdefault(user_id, loaded)
+    return _timezones[user_id]
+
+
+def _store_user_timezone(user_id: int, tz: str) -> None:
+    db = database.Database().get()
+    db["user_settings"].upsert(dict(user_id=user_id, timezone=tz), ["user_id"])
+    db.commit()
+    db.close()
+
+
+async def set_user_timezone(user_id: int, tz: str) -> bool:
+    """
+    Validates and stores the user's timezone. Returns False if it does not
+    exist.
+    """
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+    await asyncio.to_thread(_store_user_timezone, user_id, tz)
+    _timezones[user_id] = tz
+    return True
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import tempfile
+
+import aiohttp
+import discord
+
+from chiya.utils.http import sessions
+
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class WebhookCache:
+    """
+    Keeps one webhook per channel for reposting messages as their author.
+
+    The bot's own webhook in the channel is looked up, or created, the first
+    time the channel is used and reused after that. Lookups for the same
+    channel are serialized so concurrent moves do not create duplicates.
+    """
+
+    def __init__(self, name: str = "Chiya") -> None:
+        self.name = name
+        self._webhooks = {}
+        self._locks = {}
+
+    async def get(self, channel: discord.TextChannel, fallback_url: str = None) -> discord.Webhook:
+        """
+        Returns the webhook of the channel. `fallback_url` is used when the
+        bot is not allowed to manage the channel's webhooks.
+        """
+        if channel.id in self._webhooks:
+            return self._webhooks[channel.id]
+
+        async with self._locks.setdefault(channel.id, asyncio.Lock()):
+            if channel.id in self._webhooks:
+                return self._webhooks[channel.id]
+
+            try:
+                webhook = discord.utils.find(
+                    lambda hook: hook.token and hook.user and hook.user.id == channel.guild.me.id,
+                    await channel.webhooks(),
+                )
+                if not webhook:
+                    webhook = await channel.create_webhook(name=self.name)
+                    log.info(f"Created webhook for #{channel.name}")
+            except discord.Forbidden:
+                if not fallback_url:
+                    raise
+                webhook = discord.Webhook.from_url(fallback_url, session=sessions.session)
+
+            self._webhooks[channel.id] = webhook
+            return webhook
+
+    def discard(self, channel: discord.TextChannel) -> None:
+        """
+        Forgets the webhook of the channel, e.g. after it was deleted.
+        """
+        self._webhooks.pop(channel.id, None)
+
+    async def send(self, channel: discord.TextChannel, fallback_url: str = None, **kwargs) -> discord.WebhookMessage:
+        """
+        Sends through the webhook of the channel. A cached webhook that was
+        deleted in Discord is forgotten and the send retried once with a
+        freshly fetched one.
+        """
+        webhook = await self.get(channel, fallback_url=fallback_url)
+        try:
+            return await webhook.send(**kwargs)
+        except discord.NotFound:
+            log.info(f"Webhook for #{channel.name} no longer exists, fetching a new one")
+            self.discard(channel)
+            # Rewind the attachments the failed attempt already read.
+            for file in kwargs.get("files") or ():
+                file.reset()
+            webhook = await self.get(channel, fallback_url=fallback_url)
+            return await webhook.send(**kwargs)
+
+
+webhooks = WebhookCache()
+
+
+async def stream_attachment(attachment: discord.Attachment) -> discord.File:
+    """
+    Downloads an attachment in chunks into a temporary file, so large
+    uploads are not held in memory while they are reposted.
+    """
+    fp = tempfile.TemporaryFile()
+    try:
+        async with sessions.session.get(attachment.url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                fp.write(chunk)
+    except BaseException:
+        fp.close()
+        raise
+
+    fp.seek(0)
+    return discord.File(fp, filename=attachment.filename, spoiler=attachment.is_spoiler())
+
+
+async def prepare_repost(message: discord.Message) -> dict:
+    """
+    Builds the webhook send arguments reposting a message under its
+    author's name and avatar, carrying over its attachments and embeds.
+    Attachments too large for the guild's upload limit are linked instead.
+    The caller closes the returned files.
+    """
+    content = message.content
+    files = []
+    try:
+        for attachment in message.attachments:
+            if attachment.size > message.guild.filesize_limit:
+                content += f"\n{attachment.url}"
+                continue
+            files.append(await stream_attachment(attachment))
+    except BaseException:
+        # Also covers cancellation, so no temporary file outlives an aborted move.
+        for file in files:
+            file.close()
+        raise
+
+    return dict(
+        content=content or None,
+        username=message.author.display_name,
+        avatar_url=message.author.display_avatar.url,
+        # Link previews are regenerated from the content, only embeds sent by bots need copying.
+        embeds=[embed for embed in message.embeds if embed.type == "rich"],
+        files=files,
+        allowed_mentions=discord.AllowedMentions.none(),
+        wait=True,
+    )
+
+
+async def repost(
+    channel: discord.TextChannel,
+    message: discord.Message,
+    fallback_url: str = None,
+) -> discord.WebhookMessage:
+    """
+    Reposts a message through the webhook of the channel.
+    """
+    kwargs = await prepare_repost(message)
+    try:
+        return await webhooks.send(channel, fallback_url=fallback_url, **kwargs)
+    finally:
+        close_files(kwargs)
+
+
+def close_files(kwargs: dict) -> None:
+    for file in kwargs["files"]:
+        file.close()
+
+
+async def repost_many(
+    channel: discord.TextChannel,
+    messages: list,
+    fallback_url: str = None,
+    concurrency: int = 4,
+) -> list:
+    """
+    Reposts messages through the webhook of the channel in their original
+    order. Up to `concurrency` messages have their attachments downloaded
+    ahead while the sends themselves happen strictly one after another.
+    Returns the messages that were reposted, stopping at the first failure.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def prepare(message: discord.Message) -> dict:
+        async with semaphore:
+            return await prepare_repost(message)
+
+    prepared = [asyncio.create_task(prepare(message)) for message in messages]
+    reposted = []
+    try:
+        # Downloads run ahead concurrently, each send waits for its turn in the sequence.
+        for message, task in zip(messages, prepared):
+            kwargs = await task
+            try:
+                await webhooks.send(channel, fallback_url=fallback_url, **kwargs)
+            finally:
+                close_files(kwargs)
+            reposted.append(message)
+    except (discord.HTTPException, aiohttp.ClientError) as e:
+        log.warning(f"Stopped reposting after {len(reposted)} of {len(messages)} messages: {e}")
+    finally:
+        for task in prepared[len(reposted):]:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and not task.exception():
+                close_files(task.result())
+
+    return reposted